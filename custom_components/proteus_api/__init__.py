@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from datetime import timedelta
 import logging
+from time import time
+from typing import Any
 
 import aiohttp
 
@@ -12,16 +14,51 @@ from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
 from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.singleton import singleton
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-
-from .const import DOMAIN, UPDATE_INTERVAL, normalize_email
-from .proteus_api import AuthenticationError, ProteusAPI
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    COMMAND_BOUNDARY_DELAY,
+    DOMAIN,
+    MAX_UPDATE_INTERVAL,
+    POLL_JITTER,
+    QUARTER_HOUR_POLL_WINDOW,
+    UPDATE_INTERVAL,
+    normalize_email,
+)
+from .proteus_api import (
+    AuthenticationError,
+    InverterDict,
+    ProteusAPI,
+    ProteusFleetAPI,
+    get_account_key,
+)
+from .scheduler import (
+    PollScheduler,
+    get_adaptive_update_interval,
+    get_command_boundary_interval,
+    get_quarter_hour_aligned_interval,
+)
+from .session import async_get_session_factory
+from .storage import (
+    async_get_cookie_store,
+    async_get_cooldown_store,
+    async_get_inverter_store,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = [Platform.SENSOR, Platform.BINARY_SENSOR, Platform.SWITCH]
 
 
+@singleton(f"{DOMAIN}_poll_scheduler")
+@callback
+def async_get_poll_scheduler(hass: HomeAssistant) -> PollScheduler:
+    """Return the scheduler spreading the polls of all accounts."""
+    return PollScheduler(UPDATE_INTERVAL, POLL_JITTER)
+
+
 @callback
 def _async_remove_stale_devices(
     hass: HomeAssistant, entry: ConfigEntry, current_inverter_ids: set[str]
@@ -100,24 +137,16 @@ async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up Proteus API from a config entry."""
-    email = entry.data["email"]
-    password = entry.data["password"]
-
-    # Empty string for inverter_id is acceptable here as we only need to
-    # authenticate and fetch the list of available inverters.
-    temp_api = ProteusAPI("", email, password)
+async def _async_fetch_inverters(api: ProteusAPI, email: str) -> list[InverterDict]:
+    """Discover the inverters of an account during setup."""
     try:
-        inverters = await temp_api.fetch_inverters()
+        inverters = await api.fetch_inverters()
     except AuthenticationError as ex:
         _LOGGER.error("Authentication failed: %s", ex)
         raise ConfigEntryAuthFailed(f"Authentication failed: {ex}") from ex
     except (ConnectionError, aiohttp.ClientError, TimeoutError) as ex:
         _LOGGER.error("Failed to fetch inverters: %s", ex)
         raise ConfigEntryNotReady(f"Failed to fetch inverters: {ex}") from ex
-    finally:
-        await temp_api.close()
 
     if not inverters:
         _LOGGER.warning("No inverters found for account %s", email)
@@ -125,51 +154,209 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             "No inverters found for this account. Please check your account status."
         )
 
-    inverter_data = {}
-    created_apis: dict[str, ProteusAPI] = {}
+    return inverters
+
+
+async def _async_close_inverter_apis(
+    inverter_data: dict[str, dict[str, Any]],
+) -> None:
+    """Release the API clients created by a failed setup."""
+    for inverter_id, inverter_info in inverter_data.items():
+        await inverter_info["api"].close()
+        _LOGGER.debug(
+            "Closed API session for inverter %s after setup failure", inverter_id
+        )
+
+
+async def _async_setup_inverters(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    inverters: list[InverterDict],
+    email: str,
+    password: str,
+    api_kwargs: dict[str, Any],
+) -> tuple[ProteusFleetCoordinator, dict[str, dict[str, Any]]]:
+    """Create an API client and coordinator for each inverter.
+
+    The inverters are polled together by an account-level fleet coordinator,
+    which hands each inverter's data to its own coordinator.
+    """
+    inverter_data: dict[str, dict[str, Any]] = {}
+    for inverter in inverters:
+        inverter_id = inverter["id"]
+        _LOGGER.info(
+            "Setting up inverter %s (%s)",
+            inverter_id,
+            inverter.get("vendor", "Unknown"),
+        )
+
+        api = ProteusAPI(inverter_id, email, password, **api_kwargs)
+        coordinator = ProteusDataUpdateCoordinator(
+            hass,
+            _LOGGER,
+            name=f"proteus_api_{inverter_id}",
+            update_method=api.get_data,
+            update_interval=None,
+        )
+        inverter_data[inverter_id] = {
+            "coordinator": coordinator,
+            "api": api,
+            "inverter": inverter,
+        }
+
+    fleet_coordinator = ProteusFleetCoordinator(
+        hass,
+        _LOGGER,
+        name=f"proteus_api_{entry.entry_id}",
+        fleet=ProteusFleetAPI(
+            {
+                inverter_id: inverter_info["api"]
+                for inverter_id, inverter_info in inverter_data.items()
+            }
+        ),
+        coordinators={
+            inverter_id: inverter_info["coordinator"]
+            for inverter_id, inverter_info in inverter_data.items()
+        },
+        update_interval=timedelta(seconds=UPDATE_INTERVAL),
+        max_update_interval=timedelta(seconds=MAX_UPDATE_INTERVAL),
+        poll_scheduler=async_get_poll_scheduler(hass),
+    )
+
+    # All clients share the account's cooldowns, restoring them once suffices
+    account_api = next(iter(inverter_data.values()))["api"]
     try:
-        for inverter in inverters:
-            inverter_id = inverter["id"]
-            _LOGGER.info(
-                "Setting up inverter %s (%s)",
-                inverter_id,
-                inverter.get("vendor", "Unknown"),
-            )
+        await account_api.async_restore_rate_limit_cooldowns()
+        await fleet_coordinator.async_config_entry_first_refresh()
+    except BaseException:
+        await _async_close_inverter_apis(inverter_data)
+        raise
 
-            api = ProteusAPI(inverter_id, email, password)
-            created_apis[inverter_id] = api
-            coordinator = ProteusDataUpdateCoordinator(
-                hass,
-                _LOGGER,
-                name=f"proteus_api_{inverter_id}",
-                update_method=api.get_data,
-                update_interval=timedelta(seconds=UPDATE_INTERVAL),
+    failures = {
+        inverter_id: inverter_info["coordinator"].last_exception
+        for inverter_id, inverter_info in inverter_data.items()
+        if not inverter_info["coordinator"].last_update_success
+    }
+    if failures:
+        for inverter_id, failure in failures.items():
+            _LOGGER.error(
+                "First refresh of inverter %s failed: %s", inverter_id, failure
             )
+        await _async_close_inverter_apis(inverter_data)
+        inverter_id, failure = next(iter(failures.items()))
+        raise ConfigEntryNotReady(
+            f"Failed to fetch data for inverter {inverter_id}: {failure}"
+        ) from failure
 
-            await coordinator.async_config_entry_first_refresh()
+    return fleet_coordinator, inverter_data
 
-            inverter_data[inverter_id] = {
-                "coordinator": coordinator,
-                "api": api,
-                "inverter": inverter,
-            }
-    except Exception:
-        for inverter_id, api in created_apis.items():
-            await api.close()
-            _LOGGER.debug(
-                "Closed API session for inverter %s after setup failure",
-                inverter_id,
+
+async def _async_revalidate_inverters(
+    hass: HomeAssistant, entry: ConfigEntry, inverter_data: dict[str, dict[str, Any]]
+) -> None:
+    """Refresh the cached inverter list after a setup from cache."""
+    api = next(iter(inverter_data.values()))["api"]
+    try:
+        inverters = await api.fetch_inverters()
+    except (
+        AuthenticationError,
+        ConnectionError,
+        aiohttp.ClientError,
+        TimeoutError,
+    ) as ex:
+        _LOGGER.warning("Failed to revalidate cached inverters: %s", ex)
+        return
+
+    if not inverters:
+        _LOGGER.warning(
+            "No inverters found for account %s, keeping cached inverters",
+            entry.data["email"],
+        )
+        return
+
+    await async_get_inverter_store(hass).async_save_inverters(entry.entry_id, inverters)
+
+    if {inverter["id"] for inverter in inverters} != set(inverter_data):
+        _LOGGER.info("Inverters of %s changed, reloading", entry.data["email"])
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+        return
+
+    for inverter in inverters:
+        inverter_data[inverter["id"]]["inverter"].update(inverter)
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up Proteus API from a config entry."""
+    email = entry.data["email"]
+    password = entry.data["password"]
+    api_kwargs = {
+        "cookie_store": async_get_cookie_store(hass),
+        "cooldown_store": async_get_cooldown_store(hass),
+        "session_factory": async_get_session_factory(hass),
+    }
+    inverter_store = async_get_inverter_store(hass)
+
+    # Inverters discovered by an earlier setup are set up right away and
+    # revalidated in the background once the entry is loaded.
+    cached_inverters = await inverter_store.async_load_inverters(entry.entry_id)
+    from_cache = bool(cached_inverters)
+    cached_setup_error: ConfigEntryNotReady | None = None
+    if from_cache:
+        _LOGGER.debug("Setting up cached inverters for account %s", email)
+        try:
+            fleet_coordinator, inverter_data = await _async_setup_inverters(
+                hass, entry, cached_inverters, email, password, api_kwargs
             )
-        raise
+        except ConfigEntryNotReady as ex:
+            # A cached inverter may have been removed from the account
+            _LOGGER.info(
+                "Setup of cached inverters for %s failed, discovering them again",
+                email,
+            )
+            cached_setup_error = ex
+            from_cache = False
+
+    if not from_cache:
+        # Empty string for inverter_id is acceptable here as we only need to
+        # authenticate and fetch the list of available inverters. The discovery
+        # client stays open until the inverter clients have taken over its
+        # session.
+        temp_api = ProteusAPI("", email, password, **api_kwargs)
+        try:
+            inverters = await _async_fetch_inverters(temp_api, email)
+            if cached_setup_error is not None and {
+                inverter["id"] for inverter in inverters
+            } == {inverter["id"] for inverter in cached_inverters}:
+                # The cache was current, retrying the same setup would not help
+                raise cached_setup_error
+            fleet_coordinator, inverter_data = await _async_setup_inverters(
+                hass, entry, inverters, email, password, api_kwargs
+            )
+        finally:
+            await temp_api.close()
+        await inverter_store.async_save_inverters(entry.entry_id, inverters)
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
+        "coordinator": fleet_coordinator,
         "inverters": inverter_data,
     }
+    # A DataUpdateCoordinator only schedules refreshes while it has listeners.
+    # The entities listen to the inverter coordinators fed by the fleet
+    # coordinator, which has no entities of its own, so a no-op listener
+    # keeps it polling until the entry is unloaded.
+    entry.async_on_unload(fleet_coordinator.async_add_listener(lambda: None))
 
     _async_remove_stale_devices(hass, entry, set(inverter_data))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    if from_cache:
+        entry.async_create_background_task(
+            hass,
+            _async_revalidate_inverters(hass, entry, inverter_data),
+            f"{DOMAIN}_revalidate_inverters_{entry.entry_id}",
+        )
+
     return True
 
 
@@ -177,18 +364,34 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        # Close all API sessions
+        # Release the shared account session, it is closed with the last client.
+        # Hand it over so a reload does not need to log in again.
         entry_data = hass.data[DOMAIN].pop(entry.entry_id)
         for inverter_id, inverter_info in entry_data["inverters"].items():
             api = inverter_info["api"]
-            await api.close()
-            _LOGGER.debug("Closed API session for inverter %s", inverter_id)
+            await api.close(handover=True)
+            _LOGGER.debug("Released API session for inverter %s", inverter_id)
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Forget the persisted session, cooldowns and inverters of an account."""
+    account_key = get_account_key(entry.data["email"])
+    await async_get_cookie_store(hass).async_remove_cookies(account_key)
+    await async_get_cooldown_store(hass).async_remove_cooldowns(account_key)
+    await async_get_inverter_store(hass).async_remove_inverters(entry.entry_id)
+
+
 class ProteusDataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching data from the Proteus API."""
+    """Class to manage fetching data from the Proteus API.
+
+    With ``max_update_interval`` the polling interval adapts to the data,
+    between ``update_interval`` while something happens and the maximum
+    while nothing changes. It polls densely after quarter-hour boundaries and
+    right after the current command starts or ends. With ``poll_scheduler``
+    the polls are moved to the account's phase of the shared schedule.
+    """
 
     def __init__(
         self,
@@ -196,7 +399,10 @@ class ProteusDataUpdateCoordinator(DataUpdateCoordinator):
         logger: logging.Logger,
         name: str,
         update_method,
-        update_interval: timedelta,
+        update_interval: timedelta | None,
+        *,
+        max_update_interval: timedelta | None = None,
+        poll_scheduler: PollScheduler | None = None,
     ) -> None:
         """Initialize."""
         super().__init__(
@@ -206,14 +412,128 @@ class ProteusDataUpdateCoordinator(DataUpdateCoordinator):
             update_method=update_method,
             update_interval=update_interval,
         )
+        self.min_update_interval = update_interval
+        self.max_update_interval = max_update_interval
+        self._previous_snapshots: list[dict[str, Any]] | None = None
+        self._backoff_interval = (
+            update_interval.total_seconds() if update_interval is not None else 0.0
+        )
+        self.poll_scheduler = poll_scheduler
+        self.poll_account = (
+            self.config_entry.entry_id if self.config_entry is not None else name
+        )
+        if poll_scheduler is not None:
+            poll_scheduler.register(self.poll_account)
+
+    async def async_shutdown(self) -> None:
+        """Cancel any scheduled call and leave the poll schedule."""
+        await super().async_shutdown()
+        if self.poll_scheduler is not None:
+            self.poll_scheduler.unregister(self.poll_account)
 
     async def _async_update_data(self):
         """Update data via library."""
         try:
-            return await self.update_method()
+            data = await self.update_method()
         except AuthenticationError as exception:
             raise ConfigEntryAuthFailed(
                 f"Authentication failed: {exception}"
             ) from exception
         except Exception as exception:
             raise UpdateFailed(exception) from exception
+
+        if self.min_update_interval is not None and self.max_update_interval:
+            self.update_interval = self._get_next_update_interval(data)
+        return data
+
+    def _get_snapshots(self, data: Any) -> list[dict[str, Any]]:
+        """Return the parsed inverter snapshots of an update."""
+        return [data] if isinstance(data, dict) else []
+
+    def _get_next_update_interval(self, data: Any) -> timedelta:
+        """Return the polling interval following an update."""
+        snapshots = self._get_snapshots(data)
+        floor = self.min_update_interval.total_seconds()
+        now = dt_util.utcnow()
+        self._backoff_interval = get_adaptive_update_interval(
+            snapshots,
+            self._previous_snapshots,
+            self._backoff_interval,
+            floor=floor,
+            ceiling=self.max_update_interval.total_seconds(),
+            now=now,
+        )
+        self._previous_snapshots = snapshots
+        interval = self._backoff_interval
+        loop_time = self.hass.loop.time()
+        if self.poll_scheduler is not None:
+            interval = self.poll_scheduler.get_interval(
+                self.poll_account, interval, loop_time
+            )
+        # Aligned after the phase shift, which must not move polls past the
+        # next quarter-hour boundary or off the floor after it
+        interval = get_quarter_hour_aligned_interval(
+            interval,
+            time(),
+            floor=floor,
+            window=QUARTER_HOUR_POLL_WINDOW,
+        )
+        interval = get_command_boundary_interval(
+            snapshots, interval, now, delay=COMMAND_BOUNDARY_DELAY
+        )
+        if self.poll_scheduler is not None:
+            self.poll_scheduler.set_next_poll(self.poll_account, loop_time + interval)
+        return timedelta(seconds=interval)
+
+
+class ProteusFleetCoordinator(ProteusDataUpdateCoordinator):
+    """Poll all inverters of an account and update their coordinators."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        logger: logging.Logger,
+        name: str,
+        fleet: ProteusFleetAPI,
+        coordinators: dict[str, ProteusDataUpdateCoordinator],
+        update_interval: timedelta,
+        *,
+        max_update_interval: timedelta | None = None,
+        poll_scheduler: PollScheduler | None = None,
+    ) -> None:
+        """Initialize."""
+        super().__init__(
+            hass,
+            logger,
+            name=name,
+            update_method=fleet.get_data,
+            update_interval=update_interval,
+            max_update_interval=max_update_interval,
+            poll_scheduler=poll_scheduler,
+        )
+        self.coordinators = coordinators
+
+    async def _async_update_data(self):
+        """Update data of all inverters and pass it on."""
+        try:
+            data = await super()._async_update_data()
+        except (ConfigEntryAuthFailed, UpdateFailed) as exception:
+            for coordinator in self.coordinators.values():
+                coordinator.async_set_update_error(exception)
+            raise
+
+        for inverter_id, inverter_data in data.items():
+            coordinator = self.coordinators[inverter_id]
+            if isinstance(inverter_data, Exception):
+                coordinator.async_set_update_error(inverter_data)
+            else:
+                coordinator.async_set_updated_data(inverter_data)
+        return data
+
+    def _get_snapshots(self, data: Any) -> list[dict[str, Any]]:
+        """Return the parsed snapshots of all inverters."""
+        return [
+            inverter_data
+            for inverter_data in data.values()
+            if isinstance(inverter_data, dict)
+        ]
@@ -14,6 +14,8 @@ from homeassistant.exceptions import HomeAssistantError
 
 from .const import DOMAIN, normalize_email
 from .proteus_api import AuthenticationError, ProteusAPI
+from .session import async_get_session_factory
+from .storage import async_get_inverter_store
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -41,7 +43,15 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     """Validate the user input allows us to connect."""
     # Create API instance without inverter_id to test credentials
     # Empty string is acceptable here as we only need to authenticate and fetch inverters list
-    api = ProteusAPI("", data["email"], data["password"])
+    # The password is verified by a login on a session of its own, which is
+    # shared with the account only once the login succeeded
+    api = ProteusAPI(
+        "",
+        data["email"],
+        data["password"],
+        session_factory=async_get_session_factory(hass),
+        verify_credentials=True,
+    )
 
     try:
         # Test the connection by fetching inverters list
@@ -53,8 +63,8 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
         _LOGGER.error("Connection failed: %s", ex)
         raise CannotConnect from ex
     finally:
-        # Always close the API session
-        await api.close()
+        # Always release the API session, the entry setup that follows reuses it
+        await api.close(handover=True)
 
     if not inverters:
         raise NoInverters
@@ -63,6 +73,14 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     return {"title": f"Proteus API ({data['email']})"}
 
 
+async def _async_forget_inverters_of_old_account(
+    hass: HomeAssistant, entry: config_entries.ConfigEntry, email: str
+) -> None:
+    """Drop the cached inverters of an entry moving to another account."""
+    if normalize_email(email) != normalize_email(entry.data["email"]):
+        await async_get_inverter_store(hass).async_remove_inverters(entry.entry_id)
+
+
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Proteus API."""
 
@@ -100,9 +118,12 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
             else:
+                entry = self._get_reauth_entry()
+                await _async_forget_inverters_of_old_account(
+                    self.hass, entry, user_input["email"]
+                )
                 return self.async_update_reload_and_abort(
-                    self._get_reauth_entry(),
-                    data_updates=user_input,
+                    entry, data_updates=user_input
                 )
 
         return self.async_show_form(
@@ -198,6 +219,9 @@ class OptionsFlow(config_entries.OptionsFlow):
                             errors={"base": "already_configured"},
                         )
 
+                await _async_forget_inverters_of_old_account(
+                    self.hass, self.config_entry, user_input["email"]
+                )
                 updated_data = dict(self.config_entry.data)
                 updated_data["email"] = user_input["email"]
                 updated_data["password"] = user_input["password"]
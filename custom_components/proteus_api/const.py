@@ -14,7 +14,8 @@ API_STATUS_ENDPOINTS = (
     "inverters.currentStep",
 )
 API_STATUS_ENDPOINT = ",".join(API_STATUS_ENDPOINTS)
-API_ENDPOINT = ",".join((*API_STATUS_ENDPOINTS, API_PRICE_ENDPOINT))
+API_ENDPOINTS = (*API_STATUS_ENDPOINTS, *API_PRICE_ENDPOINTS)
+API_ENDPOINT = ",".join(API_ENDPOINTS)
 API_LIST_ENDPOINT = "inverters.list"
 API_CONTROL_ENDPOINT = "inverters.controls.updateManualControl"
 API_ENABLED_ENDPOINT = "inverters.controls.updateControlEnabled"
@@ -48,6 +49,24 @@ CONTROL_MODES = ["AUTOMATIC", "MANUAL"]
 COMMAND_NONE = "NONE"
 
 UPDATE_INTERVAL = 10
+# Longest interval polling backs off to while nothing changes
+MAX_UPDATE_INTERVAL = 120
+# Maximum random offset in seconds added to each account's poll phase
+POLL_JITTER = 1
+# Seconds of dense polling after each quarter-hour market interval boundary
+QUARTER_HOUR_POLL_WINDOW = 60
+# Seconds after a command starts or ends before its outcome is refreshed
+COMMAND_BOUNDARY_DELAY = 2
+
+# Seconds between refreshes of each status endpoint. Results that change on
+# known events are also invalidated by them, see proteus_api.py.
+ENDPOINT_UPDATE_INTERVALS = {
+    "inverters.detail": 5 * 60,
+    "inverters.flexibilityRewardsSummary": 15 * 60,
+    "inverters.controls.state": 5 * 60,
+    "commands.current": UPDATE_INTERVAL,
+    "inverters.currentStep": 15 * 60,
+}
 PRICE_UPDATE_INTERVAL = 15 * 60
 PRICE_UPDATE_DELAY = 5
 
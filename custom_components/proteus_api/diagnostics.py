@@ -0,0 +1,49 @@
+"""Diagnostics support for Proteus API."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+TO_REDACT = {"email", "password", "title", "unique_id"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    inverters_data = entry_data["inverters"]
+
+    # All inverter clients of the entry share one account session.
+    inverter_info = next(iter(inverters_data.values()), None)
+    session: dict[str, Any] | None = None
+    if inverter_info is not None:
+        api = inverter_info["api"]
+        connector_profile = api.connector_profile
+        session = {
+            "shared_connector": connector_profile is None,
+            "connector_profile": (
+                dict(connector_profile) if connector_profile is not None else None
+            ),
+            "request_stats": api.request_stats.as_dict(),
+            "rate_limiter": api.rate_limiter.as_dict(),
+        }
+
+    # Spread of the polls of all accounts, without identifying them
+    poll_scheduler = getattr(entry_data.get("coordinator"), "poll_scheduler", None)
+    poll_schedule: dict[str, Any] | None = None
+    if poll_scheduler is not None:
+        poll_schedule = poll_scheduler.as_dict(hass.loop.time())
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "inverters": sorted(inverters_data),
+        "session": session,
+        "poll_schedule": poll_schedule,
+    }
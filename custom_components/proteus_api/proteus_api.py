@@ -2,47 +2,121 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+import asyncio
+from collections.abc import Callable, Mapping
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from http.cookies import Morsel
 import json
 from json import JSONDecodeError
 import logging
 from math import ceil
 import re
+import socket
 from time import monotonic, time
-from typing import Any, ClassVar, TypedDict, cast
+from types import SimpleNamespace
+from typing import Any, ClassVar, Protocol, TypedDict, cast
 
 import aiohttp
 from aiohttp.client_exceptions import ClientConnectionError
 from aiohttp_retry import ExponentialRetry, RetryClient
+from yarl import URL
 
 from .const import (
     API_BASE_URL,
     API_CONTROL_ENDPOINT,
     API_ENABLED_ENDPOINT,
+    API_ENDPOINTS,
     API_FLEXIBILITY_ENDPOINT,
     API_LIST_ENDPOINT,
     API_LOGIN_ENDPOINT,
     API_MODE_ENDPOINT,
     API_PRICE_ENDPOINT,
     API_PRICE_ENDPOINTS,
-    API_STATUS_ENDPOINT,
     API_STATUS_ENDPOINTS,
+    COMMAND_BOUNDARY_DELAY,
     COMMAND_NONE,
+    ENDPOINT_UPDATE_INTERVALS,
     FLEXIBILITY_CAPABILITIES,
     PRICE_UPDATE_DELAY,
     PRICE_UPDATE_INTERVAL,
     TID_DELTA_GREEN,
     UPDATE_INTERVAL,
+    normalize_email,
 )
+from .scheduler import get_seconds_until_command_boundary
 
 _LOGGER = logging.getLogger(__name__)
 
 TRPC_RATE_LIMIT_CODE = -32029
+# tRPC UNAUTHORIZED and FORBIDDEN codes and HTTP statuses of rejected sessions
+TRPC_AUTH_ERROR_CODES = (-32001, -32003)
+SESSION_REJECTED_HTTP_STATUSES = (401, 403)
 TRPC_RATE_LIMIT_HTTP_STATUS = 429
 TRPC_RATE_LIMIT_RETRY_RE = re.compile(
     r"try again in (?P<seconds>\d+) seconds?", re.IGNORECASE
 )
 RATE_LIMIT_ERROR_INTERVAL = 300
+# Client-side request budget of one account in requests per second. The rate
+# grows by RATE_LIMIT_INCREASE after each accepted request and is multiplied
+# by RATE_LIMIT_DECREASE whenever the server rate-limits the account.
+RATE_LIMIT_RATE = 0.5
+RATE_LIMIT_MIN_RATE = 0.05
+RATE_LIMIT_MAX_RATE = 1.0
+RATE_LIMIT_INCREASE = 0.05
+RATE_LIMIT_DECREASE = 0.5
+RATE_LIMIT_BURST = 5
+# Tokens polls leave in the bucket for writes
+RATE_LIMIT_WRITE_RESERVE = 1
+# Longest time a write waits for a token before giving up
+RATE_LIMIT_MAX_WRITE_WAIT = 5
+# Times the failed procedures of a partially failed batch are requested again
+PARTIAL_BATCH_RETRIES = 1
+# Procedures per tRPC batch request, larger fleet batches are split so their
+# GET URLs stay well below the common 8 KB proxy and server limits
+MAX_BATCH_PROCEDURES = 20
+CSRF_COOKIE = "proteus_csrf"
+# Do not restore persisted cookies that are about to expire anyway.
+PERSISTED_COOKIE_EXPIRY_MARGIN = 60
+# Renew the session this many seconds before its cookies expire, at most
+# half of its remaining lifetime.
+SESSION_RENEW_MARGIN = 300
+# Keep a released session open for clients taking it over, e.g. the config
+# entry setup following a config flow.
+SESSION_HANDOVER_TIMEOUT = 60
+LOGIN_BACKOFF_INITIAL = 30
+# A session rejected sooner than this after its login is not renewed again,
+# the rejection is then unlikely to be caused by an expired session.
+SESSION_RELOGIN_MIN_INTERVAL = 60
+LOGIN_BACKOFF_MAX = 900
+API_URL = URL(API_BASE_URL)
+REQUEST_HEADERS = {
+    "Content-Type": "application/json",
+    "Origin": "https://proteus.deltagreen.cz",
+    "Accept": "*/*",
+    "Referer": "https://proteus.deltagreen.cz",
+}
+POST_REQUEST_HEADERS = {**REQUEST_HEADERS, "trpc-accept": "application/jsonl"}
+# Cached endpoint results made stale by a successful write of this client
+WRITE_INVALIDATED_ENDPOINTS = {
+    API_CONTROL_ENDPOINT: ("inverters.controls.state",),
+    API_ENABLED_ENDPOINT: ("inverters.detail",),
+    API_MODE_ENDPOINT: ("inverters.detail", "inverters.controls.state"),
+    API_FLEXIBILITY_ENDPOINT: ("inverters.controls.state",),
+}
+# Cached endpoint results made stale by the end of a flexibility command
+COMMAND_END_INVALIDATED_ENDPOINTS = ("inverters.flexibilityRewardsSummary",)
+# Endpoints refreshed right after the current command starts or ends
+COMMAND_BOUNDARY_ENDPOINTS = (
+    "commands.current",
+    "inverters.flexibilityRewardsSummary",
+)
+# Endpoints refreshed right after each quarter-hour boundary
+QUARTER_HOUR_ENDPOINTS = ("inverters.currentStep",)
+INVERTER_LIST_PARAMS = {
+    "batch": "1",
+    "input": json.dumps({"0": {"json": None, "meta": {"values": ["undefined"]}}}),
+}
 
 
 class AuthenticationError(Exception):
@@ -53,6 +127,10 @@ class ProteusConnectionError(ConnectionError):
     """Exception raised for Proteus API connection failures."""
 
 
+class SessionRejectedError(ProteusConnectionError):
+    """Exception raised when the server rejects the session of a request."""
+
+
 def format_connection_error(exception: BaseException) -> str:
     """Format transport errors for user-facing Home Assistant retry messages."""
     message = str(exception)
@@ -68,6 +146,38 @@ def format_connection_error(exception: BaseException) -> str:
     return f"Failed to connect to Proteus API ({type(exception).__name__})"
 
 
+class ConnectorProfile(TypedDict):
+    """TCP/TLS connector settings for the Proteus API session."""
+
+    keepalive_timeout: float
+    ttl_dns_cache: int
+    limit_per_host: int
+    family: int
+
+
+# Keep connections alive across several 10 second polls, cache DNS and limit
+# parallel connections since all inverters of an account share the session.
+DEFAULT_CONNECTOR_PROFILE = ConnectorProfile(
+    keepalive_timeout=4 * UPDATE_INTERVAL,
+    ttl_dns_cache=300,
+    limit_per_host=4,
+    family=socket.AF_UNSPEC,
+)
+
+
+# Creates an aiohttp session from ClientSession keyword arguments. Sessions
+# created by a factory use a connector owned by someone else, they are detached
+# instead of closed.
+type SessionFactory = Callable[..., aiohttp.ClientSession]
+
+
+class CachedEndpoint(TypedDict):
+    """Parsed result of one endpoint and when it was fetched."""
+
+    data: dict[str, Any]
+    fetched_at: float
+
+
 class InverterDict(TypedDict):
     """Inverter definition as retrieved from the API."""
 
@@ -241,6 +351,35 @@ def is_trpc_rate_limit_error(error: dict[str, Any]) -> bool:
     return message is not None and "rate limit" in message.casefold()
 
 
+def is_trpc_auth_error(error: dict[str, Any]) -> bool:
+    """Return whether a tRPC error rejects the session of the request."""
+    if _coerce_int(get_trpc_error_code(error)) in TRPC_AUTH_ERROR_CODES:
+        return True
+
+    error_data = get_trpc_error_data(error)
+    if _coerce_int(error_data.get("httpStatus")) in SESSION_REJECTED_HTTP_STATUSES:
+        return True
+    return error_data.get("code") in ("UNAUTHORIZED", "FORBIDDEN")
+
+
+def is_session_rejected(status: int, payload: Any) -> bool:
+    """Return whether a response rejects the session of its request.
+
+    Besides HTTP 401/403 only a batch whose procedures all fail with auth
+    errors rejects the session. An auth error of a single procedure, e.g. for
+    an inverter the account can no longer access, fails just that procedure.
+    """
+    if status in SESSION_REJECTED_HTTP_STATUSES:
+        return True
+    errors = [
+        get_top_level_trpc_error(item)
+        for item in (payload if isinstance(payload, list) else [payload])
+    ]
+    return bool(errors) and all(
+        error is not None and is_trpc_auth_error(error) for error in errors
+    )
+
+
 def get_trpc_rate_limit_retry_after(error: dict[str, Any]) -> int | None:
     """Return the retry delay from a tRPC rate-limit error if present."""
     error_data = get_trpc_error_data(error)
@@ -282,6 +421,38 @@ def extract_trpc_rate_limit_retry_after(payload: Any) -> int | None:
     return None
 
 
+def get_failed_procedure_indices(payload: Any) -> tuple[int, ...]:
+    """Return the batch indices of procedures worth requesting again.
+
+    Rate-limited procedures wait for their cooldown and procedures denied by
+    an auth error would fail again, both are left out.
+    """
+    if not isinstance(payload, list):
+        return ()
+
+    failed = []
+    for index, item in enumerate(payload):
+        error = get_top_level_trpc_error(item)
+        if (
+            error is not None
+            and not is_trpc_rate_limit_error(error)
+            and not is_trpc_auth_error(error)
+        ):
+            failed.append(index)
+    return tuple(failed)
+
+
+def has_trpc_result(payload: Any, index: int) -> bool:
+    """Return whether a batched procedure returned a result, including null."""
+    if not isinstance(payload, list) or len(payload) <= index:
+        return False
+
+    try:
+        return "json" in payload[index]["result"]["data"]
+    except (KeyError, TypeError):
+        return False
+
+
 def get_trpc_result_json(payload: Any, index: int) -> Any | None:
     """Return one JSON result from a batched tRPC payload."""
     if not isinstance(payload, list) or len(payload) <= index:
@@ -406,12 +577,17 @@ def parse_price_data(raw_data: Any) -> dict[str, Any]:
     return parse_price_payload(get_trpc_result_json(raw_data, 0))
 
 
-def get_seconds_until_next_price_update(now: float) -> float:
-    """Return seconds until the next quarter-hour price refresh."""
+def get_seconds_until_next_quarter_hour(now: float) -> float:
+    """Return seconds until shortly after the next quarter-hour boundary."""
     next_boundary = (int(now // PRICE_UPDATE_INTERVAL) + 1) * PRICE_UPDATE_INTERVAL
     return max(0, next_boundary - now + PRICE_UPDATE_DELAY)
 
 
+def get_seconds_until_next_price_update(now: float) -> float:
+    """Return seconds until the next quarter-hour price refresh."""
+    return get_seconds_until_next_quarter_hour(now)
+
+
 def is_number(value: Any) -> bool:
     """Return whether a value is a non-boolean API number."""
     return isinstance(value, int | float) and not isinstance(value, bool)
@@ -573,116 +749,850 @@ def parse_current_step_payload(current_step: Any) -> dict[str, Any]:
     return parsed
 
 
+ENDPOINT_PARSERS: dict[str, Callable[[Any], dict[str, Any]]] = {
+    "inverters.detail": parse_detail_payload,
+    "inverters.flexibilityRewardsSummary": parse_rewards_payload,
+    "inverters.controls.state": parse_controls_payload,
+    "commands.current": parse_command_payload,
+    "inverters.currentStep": parse_current_step_payload,
+}
+
+
+def parse_endpoint_data(endpoint: str, result: Any) -> dict[str, Any]:
+    """Parse the result of one status endpoint."""
+    return ENDPOINT_PARSERS[endpoint](result)
+
+
+def has_command_ended(previous: dict[str, Any] | None, current: dict[str, Any]) -> bool:
+    """Return whether a parsed command update ends the previous command."""
+    if previous is None or previous.get("current_command") in (None, COMMAND_NONE):
+        return False
+    return current.get("current_command") == COMMAND_NONE or current.get(
+        "command_id"
+    ) != previous.get("command_id")
+
+
 def parse_data(raw_data: Any) -> dict[str, Any]:
-    """Parse raw API data into structured format."""
-    if not isinstance(raw_data, list) or len(raw_data) < 5:
+    """Parse a full batch ordered like API_ENDPOINTS into one snapshot.
+
+    Polls parse each endpoint on its own with :func:`parse_endpoint_data`,
+    this helper is only kept for the parser tests.
+    """
+    if not isinstance(raw_data, list) or len(raw_data) < len(API_STATUS_ENDPOINTS):
         _LOGGER.error("Missing data: %s", raw_data)
         return {}
 
     parsed: dict[str, Any] = {}
-    parsed.update(parse_detail_payload(get_trpc_result_json(raw_data, 0)))
-    parsed.update(parse_rewards_payload(get_trpc_result_json(raw_data, 1)))
-    parsed.update(parse_controls_payload(get_trpc_result_json(raw_data, 2)))
-    parsed.update(parse_command_payload(get_trpc_result_json(raw_data, 3)))
-    parsed.update(parse_current_step_payload(get_trpc_result_json(raw_data, 4)))
-    parsed.update(parse_price_payload(get_trpc_result_json(raw_data, 5)))
-
-    _LOGGER.debug("Parsed status %s", parsed)
+    for index, endpoint in enumerate(API_STATUS_ENDPOINTS):
+        parsed.update(
+            parse_endpoint_data(endpoint, get_trpc_result_json(raw_data, index))
+        )
+    parsed.update(
+        parse_price_payload(get_trpc_result_json(raw_data, len(API_STATUS_ENDPOINTS)))
+    )
     return parsed
 
 
-class ProteusAPI:
-    """Proteus API client."""
+class CookieStore(Protocol):
+    """Storage backend for persisted session cookies."""
 
-    _rate_limited_until_by_scope: ClassVar[dict[tuple[str, str, str], float]] = {}
-    _next_rate_limit_error_by_scope: ClassVar[dict[tuple[str, str, str], float]] = {}
+    async def async_load_cookies(
+        self, account_key: tuple[str, str]
+    ) -> dict[str, Any] | None:
+        """Return the stored cookies for an account."""
+
+    async def async_save_cookies(
+        self, account_key: tuple[str, str], data: dict[str, Any]
+    ) -> None:
+        """Store cookies for an account."""
+
+    async def async_remove_cookies(self, account_key: tuple[str, str]) -> None:
+        """Forget stored cookies for an account."""
+
+
+class CooldownStore(Protocol):
+    """Storage backend for persisted rate-limit cooldowns."""
+
+    async def async_load_cooldowns(
+        self, account_key: tuple[str, str]
+    ) -> dict[str, float]:
+        """Return the stored wall-clock cooldown deadlines by scope."""
+
+    async def async_save_cooldowns(
+        self, account_key: tuple[str, str], cooldowns: dict[str, float]
+    ) -> None:
+        """Store wall-clock cooldown deadlines by scope."""
+
+
+def get_account_key(email: str, tenant: str = TID_DELTA_GREEN) -> tuple[str, str]:
+    """Return the key identifying a Proteus account."""
+    return (tenant, normalize_email(email))
+
+
+def get_cookie_expiry(cookies: Mapping[str, Morsel[str]], now: float) -> float | None:
+    """Return when the session cookies set by a response expire.
+
+    This is the earliest wall-clock expiry of the cookies besides the CSRF
+    token. Cookies the response deletes, with ``Max-Age=0`` or an expiry in
+    the past, do not limit the session.
+    """
+    expiry = None
+    for name, morsel in cookies.items():
+        if name == CSRF_COOKIE:
+            continue
+        max_age = _coerce_int(morsel["max-age"]) if morsel["max-age"] else None
+        if max_age is not None:
+            cookie_expiry = now + max_age
+        elif morsel["expires"]:
+            try:
+                cookie_expiry = parsedate_to_datetime(morsel["expires"]).timestamp()
+            except (TypeError, ValueError):
+                continue
+        else:
+            continue
+        if cookie_expiry <= now:
+            continue
+        if expiry is None or cookie_expiry < expiry:
+            expiry = cookie_expiry
+    return expiry
+
+
+def parse_response_body(response_text: str) -> Any | None:
+    """Parse JSON or JSONL response body if possible."""
+    if not response_text:
+        return None
+    try:
+        return json.loads(response_text)
+    except JSONDecodeError:
+        pass
+
+    lines = [line.strip() for line in response_text.splitlines() if line.strip()]
+    if not lines:
+        return None
+
+    parsed_lines = []
+    for line in lines:
+        try:
+            parsed_lines.append(json.loads(line))
+        except JSONDecodeError:
+            return None
+
+    if len(parsed_lines) == 1:
+        return parsed_lines[0]
+    return parsed_lines
+
+
+class ProteusRateLimiter:
+    """Token bucket limiting the request rate of one account.
+
+    The refill rate adapts AIMD-style: it grows additively with every
+    accepted request and is cut multiplicatively when the server rate-limits
+    the account. A rejected request also empties the bucket, and a
+    server-sent retry delay pauses it entirely.
+
+    Polls are low priority, they only take a token while enough are left for
+    writes and are deferred otherwise. Writes may wait for a token.
+    """
 
     def __init__(
         self,
-        inverter_id: str,
-        email: str,
-        password: str,
-        tenant: str = TID_DELTA_GREEN,
+        rate: float = RATE_LIMIT_RATE,
+        burst: float = RATE_LIMIT_BURST,
+        *,
+        min_rate: float = RATE_LIMIT_MIN_RATE,
+        max_rate: float = RATE_LIMIT_MAX_RATE,
     ) -> None:
-        """Initialize the API client."""
-        self.inverter_id = inverter_id
+        """Initialize a full bucket."""
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.tokens = burst
+        self.blocked_until = 0.0
+        self.deferred_requests = 0
+        self._updated = monotonic()
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens accrued since the last update."""
+        if now > self._updated:
+            self.tokens = min(
+                self.burst, self.tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+
+    def get_delay(self, reserve: float = 0) -> float:
+        """Return the seconds until a token above the reserve is available."""
+        now = monotonic()
+        self._refill(now)
+        missing = max(0.0, reserve + 1 - self.tokens)
+        return max(self.blocked_until - now, missing / self.rate, 0.0)
+
+    def try_acquire(self, reserve: float = 0) -> bool:
+        """Take a token if one above the reserve is available right now."""
+        if self.get_delay(reserve):
+            self.deferred_requests += 1
+            return False
+        self.tokens -= 1
+        return True
+
+    async def acquire(self, max_wait: float) -> bool:
+        """Wait up to ``max_wait`` seconds for a token and take it.
+
+        Concurrent waiters may take the token first or the server may pause
+        the bucket meanwhile, so the delay is checked again after each wait.
+        """
+        deadline = monotonic() + max_wait
+        while delay := self.get_delay():
+            if monotonic() + delay > deadline:
+                self.deferred_requests += 1
+                return False
+            await asyncio.sleep(delay)
+        self.tokens -= 1
+        return True
+
+    def on_success(self) -> None:
+        """Increase the rate after an accepted request."""
+        self.rate = min(self.max_rate, self.rate + RATE_LIMIT_INCREASE)
+
+    def on_rate_limited(self, retry_after: float | None = None) -> None:
+        """Decrease the rate after the server rate-limited a request.
+
+        ``retry_after`` pauses the whole bucket, for rejections of the entire
+        request rather than of single procedures.
+        """
+        now = monotonic()
+        self._refill(now)
+        self.rate = max(self.min_rate, self.rate * RATE_LIMIT_DECREASE)
+        self.tokens = min(self.tokens, 0.0)
+        if retry_after is not None:
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the limiter state for diagnostics."""
+        return {
+            "rate": round(self.rate, 3),
+            "tokens": round(self.tokens, 3),
+            "blocked_for": max(0, ceil(self.blocked_until - monotonic())),
+            "deferred_requests": self.deferred_requests,
+        }
+
+
+def evict_expired(deadlines: dict[Any, float], now: float) -> None:
+    """Drop the entries of a deadline map that have passed."""
+    for key in [key for key, deadline in deadlines.items() if deadline <= now]:
+        del deadlines[key]
+
+
+class ProteusRequestStats:
+    """Request latency and connection reuse counters of one session.
+
+    The counters are collected through aiohttp tracing and make the effect of
+    the connector profile visible in the integration diagnostics.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.requests = 0
+        self.failed_requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.dns_cache_hits = 0
+        self.dns_cache_misses = 0
+        self.total_request_time = 0.0
+        self.max_request_time = 0.0
+
+    def create_trace_config(self) -> aiohttp.TraceConfig:
+        """Return a trace config updating these counters."""
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_request_end.append(self._on_request_end)
+        trace_config.on_request_exception.append(self._on_request_exception)
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        trace_config.on_dns_cache_hit.append(self._on_dns_cache_hit)
+        trace_config.on_dns_cache_miss.append(self._on_dns_cache_miss)
+        return trace_config
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for diagnostics."""
+        connections = self.connections_created + self.connections_reused
+        return {
+            "requests": self.requests,
+            "failed_requests": self.failed_requests,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "connection_reuse_rate": (
+                round(self.connections_reused / connections, 3) if connections else None
+            ),
+            "dns_cache_hits": self.dns_cache_hits,
+            "dns_cache_misses": self.dns_cache_misses,
+            "mean_request_time": (
+                round(self.total_request_time / self.requests, 3)
+                if self.requests
+                else None
+            ),
+            "max_request_time": round(self.max_request_time, 3),
+        }
+
+    async def _on_request_start(
+        self, session: Any, context: SimpleNamespace, params: Any
+    ) -> None:
+        context.start = monotonic()
+
+    async def _on_request_end(
+        self, session: Any, context: SimpleNamespace, params: Any
+    ) -> None:
+        elapsed = monotonic() - context.start
+        self.requests += 1
+        self.total_request_time += elapsed
+        self.max_request_time = max(self.max_request_time, elapsed)
+
+    async def _on_request_exception(
+        self, session: Any, context: SimpleNamespace, params: Any
+    ) -> None:
+        self.failed_requests += 1
+
+    async def _on_connection_create_end(
+        self, session: Any, context: SimpleNamespace, params: Any
+    ) -> None:
+        self.connections_created += 1
+
+    async def _on_connection_reuseconn(
+        self, session: Any, context: SimpleNamespace, params: Any
+    ) -> None:
+        self.connections_reused += 1
+
+    async def _on_dns_cache_hit(
+        self, session: Any, context: SimpleNamespace, params: Any
+    ) -> None:
+        self.dns_cache_hits += 1
+
+    async def _on_dns_cache_miss(
+        self, session: Any, context: SimpleNamespace, params: Any
+    ) -> None:
+        self.dns_cache_misses += 1
+
+
+class ProteusCookieJar(aiohttp.CookieJar):
+    """Cookie jar remembering the current CSRF token.
+
+    The token is looked up in the jar only after the server sent a new CSRF
+    cookie, so building request headers does not need to scan the jar.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        """Initialize the cookie jar."""
+        super().__init__(**kwargs)
+        self._csrf_token: str | None = None
+        self._csrf_stale = False
+
+    @property
+    def csrf_token(self) -> str | None:
+        """Return the current CSRF token."""
+        if self._csrf_stale:
+            self._csrf_stale = False
+            morsel = self.filter_cookies(API_URL).get(CSRF_COOKIE)
+            self._csrf_token = morsel.value if morsel is not None else None
+        return self._csrf_token
+
+    def update_cookies(self, cookies: Any, response_url: URL = URL()) -> None:
+        """Update cookies and note when a new CSRF cookie arrived."""
+        super().update_cookies(cookies, response_url)
+        names = (
+            cookies.keys()
+            if isinstance(cookies, Mapping)
+            else (name for name, _value in cookies)
+        )
+        if CSRF_COOKIE in names:
+            self._csrf_stale = True
+
+    def clear(self, predicate: Any = None) -> None:
+        """Remove cookies and forget the CSRF token."""
+        super().clear(predicate)
+        self._csrf_stale = True
+
+
+async def extract_error_message(response: aiohttp.ClientResponse) -> str | None:
+    """Extract error message from API response body."""
+    try:
+        data = await response.json()
+        return data["error"]["json"]["message"]
+    except (aiohttp.ContentTypeError, JSONDecodeError, KeyError, TypeError):
+        return None
+
+
+async def log_response_error(response: aiohttp.ClientResponse) -> None:
+    """Log a failed API response including its body when it is JSON."""
+    try:
+        data = await response.json()
+    except (aiohttp.ContentTypeError, JSONDecodeError):
+        _LOGGER.error(
+            "API %s request %s failed with status %s",
+            response.method,
+            response.url,
+            response.status,
+        )
+    else:
+        _LOGGER.error(
+            "API %s request %s failed with status %s (%s)",
+            response.method,
+            response.url,
+            response.status,
+            data,
+        )
+
+
+class ProteusAccountSession:
+    """Authenticated aiohttp session shared by all clients of one account.
+
+    Sessions are keyed by tenant and normalized email, so every inverter of an
+    account borrows the same login and connection pool. Clients register with
+    :meth:`acquire` and the session is closed once the last one releases it.
+
+    With a cookie store attached, the cookies of a successful login are
+    persisted and restored on the next start instead of logging in again.
+
+    Logins are single-flight, the session is renewed shortly before its
+    cookies expire and rejected credentials back off exponentially instead of
+    hitting the login endpoint on every poll.
+
+    Clients verifying their credentials, or with a password differing from
+    the shared session's, get a candidate session of their own. It never restores persisted cookies and is
+    shared with the account only once its password login succeeded, so
+    unverified credentials cannot disturb the running session.
+    """
+
+    _sessions: ClassVar[dict[tuple[str, str], ProteusAccountSession]] = {}
+    _candidates: ClassVar[dict[tuple[tuple[str, str], str], ProteusAccountSession]] = {}
+
+    def __init__(self, email: str, password: str, tenant: str) -> None:
+        """Initialize the account session."""
         self.email = email
         self.password = password
         self.tenant = tenant
-        self._session = None
-        self._last_data: dict[str, Any] | None = None
-        self._last_price_data: dict[str, Any] | None = None
-        self._next_price_update = 0.0
-        self._account_key = (self.tenant, self.email.strip().casefold())
+        self.key = get_account_key(email, tenant)
+        self.shared = True
+        self.cookie_store: CookieStore | None = None
+        self.cooldown_store: CooldownStore | None = None
+        self.connector_profile = DEFAULT_CONNECTOR_PROFILE
+        self.session_factory: SessionFactory | None = None
+        self.stats = ProteusRequestStats()
+        self.rate_limiter = ProteusRateLimiter()
+        self.session: aiohttp.ClientSession | None = None
+        self.login_required = False
+        self.expires_at: float | None = None
+        self.renew_at: float | None = None
+        self.authenticated_at: float | None = None
+        self.users = 0
+        self._login_task: asyncio.Task[aiohttp.ClientSession] | None = None
+        self._handover_handle: asyncio.TimerHandle | None = None
+        self._handover_task: asyncio.Task[None] | None = None
+        self._login_failures = 0
+        self._login_blocked_until = 0.0
+        self._last_login_error: AuthenticationError | None = None
+        self._rejected_login_at: float | None = None
+        self._headers = REQUEST_HEADERS
+        self._post_headers = POST_REQUEST_HEADERS
+        self._headers_jar: aiohttp.abc.AbstractCookieJar | None = None
+        self._headers_csrf: str | None = None
+
+    @classmethod
+    def acquire(
+        cls,
+        email: str,
+        password: str,
+        tenant: str = TID_DELTA_GREEN,
+        *,
+        cookie_store: CookieStore | None = None,
+        cooldown_store: CooldownStore | None = None,
+        connector_profile: ConnectorProfile | None = None,
+        session_factory: SessionFactory | None = None,
+        verify_credentials: bool = False,
+    ) -> ProteusAccountSession:
+        """Return the shared session for an account and register one more user.
+
+        With ``verify_credentials``, or a password differing from the shared
+        session's, a candidate session is returned instead, see the class
+        docstring.
+        """
+        key = get_account_key(email, tenant)
+        account = cls._sessions.get(key)
+        if account is None and not verify_credentials:
+            account = cls(email, password, tenant)
+            cls._sessions[key] = account
+        elif verify_credentials or account.password != password:
+            account = cls._candidates.get((key, password))
+            if account is None:
+                account = cls(email, password, tenant)
+                account.shared = False
+                cls._candidates[key, password] = account
+        if cookie_store is not None:
+            account.cookie_store = cookie_store
+        if cooldown_store is not None:
+            account.cooldown_store = cooldown_store
+        if connector_profile is not None:
+            # Applies to the next session, an open one keeps its connector.
+            account.connector_profile = connector_profile
+        if session_factory is not None and account.session is None:
+            account.session_factory = session_factory
+        account.retain()
+        return account
+
+    def retain(self) -> None:
+        """Register one more user and keep a handed over session open."""
+        self.users += 1
+        if self._handover_handle is not None:
+            self._handover_handle.cancel()
+            self._handover_handle = None
+
+    def reset_login_backoff(self) -> None:
+        """Allow the next login attempt immediately."""
+        self._login_failures = 0
+        self._login_blocked_until = 0.0
+        self._last_login_error = None
+        self._rejected_login_at = None
+
+    async def release(self, *, handover: bool = False) -> None:
+        """Unregister one user and close the session once nobody uses it.
+
+        With ``handover`` an authenticated session stays open for a while, so
+        clients created shortly after (e.g. by a config entry setup following a
+        config flow) can take it over instead of logging in again.
+        """
+        self.users -= 1
+        if self.users > 0:
+            return
+        if (
+            handover
+            and self.shared
+            and self.session is not None
+            and not self.session.closed
+        ):
+            _LOGGER.debug("Keeping API session for %s for handover", self.email)
+            self._handover_handle = asyncio.get_running_loop().call_later(
+                SESSION_HANDOVER_TIMEOUT, self._handover_expired
+            )
+            return
+        await self._close_unused()
+
+    def _handover_expired(self) -> None:
+        """Close a handed over session nobody took over."""
+        self._handover_handle = None
+        self._handover_task = asyncio.get_running_loop().create_task(
+            self._close_unused()
+        )
+
+    async def _close_unused(self) -> None:
+        """Forget and close the session unless it got a new user."""
+        if self.users > 0:
+            return
+        if self._sessions.get(self.key) is self:
+            del self._sessions[self.key]
+        if self._candidates.get((self.key, self.password)) is self:
+            del self._candidates[self.key, self.password]
+        await self.close()
+
+    async def _share(self) -> None:
+        """Share a candidate session whose password login succeeded.
+
+        An unused shared session is replaced by the candidate, one in use only
+        takes over the verified password for its next login.
+        """
+        if self.shared:
+            return
+        if self._candidates.get((self.key, self.password)) is self:
+            del self._candidates[self.key, self.password]
+        account = self._sessions.get(self.key)
+        if account is not None and account.users > 0:
+            _LOGGER.debug("Verified new credentials for %s", self.email)
+            account.password = self.password
+            account.reset_login_backoff()
+            return
+
+        self.shared = True
+        self._sessions[self.key] = self
+        if account is not None:
+            await account.close()
 
     def get_headers(self, *, for_post: bool = False) -> dict[str, str]:
-        """Build HTTP headers for the next request.
+        """Return HTTP headers for the next request.
 
-        Includes CSRF header if session is open.
+        Includes CSRF header if session is open. The header sets are cached per
+        session and rebuilt only after the CSRF cookie changed, the returned
+        dictionaries must not be modified.
+        """
+        if self.session is None:
+            return POST_REQUEST_HEADERS if for_post else REQUEST_HEADERS
+
+        cookie_jar = self.session.cookie_jar
+        csrf_token = (
+            cookie_jar.csrf_token if isinstance(cookie_jar, ProteusCookieJar) else None
+        )
+        if self._headers_jar is not cookie_jar or self._headers_csrf != csrf_token:
+            csrf_header = {} if csrf_token is None else {"x-proteus-csrf": csrf_token}
+            self._headers = {**REQUEST_HEADERS, **csrf_header}
+            self._post_headers = {**POST_REQUEST_HEADERS, **csrf_header}
+            self._headers_jar = cookie_jar
+            self._headers_csrf = csrf_token
+        return self._post_headers if for_post else self._headers
+
+    def _is_session_usable(self) -> bool:
+        """Return whether the current session can be used without a login."""
+        if self.login_required or self.session is None or self.session.closed:
+            return False
+        return self.renew_at is None or time() < self.renew_at
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Get the authenticated aiohttp session, logging in when needed.
+
+        Concurrent callers share one in-flight login, so an expired session is
+        renewed once per account no matter how many clients need it.
         """
-        result = {
-            "Content-Type": "application/json",
-            "Origin": "https://proteus.deltagreen.cz",
-            "Accept": "*/*",
-            "Referer": "https://proteus.deltagreen.cz",
+        if self._login_task is None and not self._is_session_usable():
+            self._login_task = asyncio.get_running_loop().create_task(
+                self._authenticate()
+            )
+            self._login_task.add_done_callback(self._clear_login_task)
+        if self._login_task is not None:
+            return await asyncio.shield(self._login_task)
+        return cast(aiohttp.ClientSession, self.session)
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create a new aiohttp session with a cookie jar isolated per account."""
+        session_kwargs: dict[str, Any] = {
+            "timeout": aiohttp.ClientTimeout(total=25),
+            "headers": self.get_headers(),
+            "cookie_jar": ProteusCookieJar(),
+            "trace_configs": [self.stats.create_trace_config()],
         }
-        if for_post:
-            result["trpc-accept"] = "application/jsonl"
-        if self._session is not None:
-            result["x-proteus-csrf"] = self._session.cookie_jar.filter_cookies(
-                API_BASE_URL
-            )["proteus_csrf"].value
-        return result
+        if self.session_factory is not None:
+            return self.session_factory(**session_kwargs)
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(**self.connector_profile),
+            **session_kwargs,
+        )
 
-    async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session."""
-        if self._session is None or self._session.closed:
+    def _clear_login_task(self, task: asyncio.Task[aiohttp.ClientSession]) -> None:
+        """Forget a finished login task."""
+        if self._login_task is task:
+            self._login_task = None
+
+    async def _authenticate(self) -> aiohttp.ClientSession:
+        """Create, restore or renew the authenticated session."""
+        now = time()
+        if now < self._login_blocked_until and self._last_login_error is not None:
+            _LOGGER.debug(
+                "Skipping login for %s, retrying after %s seconds",
+                self.email,
+                ceil(self._login_blocked_until - now),
+            )
+            raise AuthenticationError(str(self._last_login_error))
+
+        if self.login_required:
+            self.login_required = False
+            await self._reset_session()
+
+        renewing = self.session is not None and not self.session.closed
+        if renewing:
+            _LOGGER.debug("Renewing API session for %s before it expires", self.email)
+        else:
             _LOGGER.debug(
                 "Creating new API session for %s / %s",
                 self.tenant,
-                self.inverter_id,
-            )
-            self._session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=25),
-                headers=self.get_headers(),
+                self.email,
             )
+            self.session = self._create_session()
+            if await self._restore_cookies():
+                self.authenticated_at = time()
+                return self.session
 
-            payload = {
-                "json": {
-                    "tenantId": self.tenant,
-                    "email": self.email,
-                    "password": self.password,
-                }
+        try:
+            await self._login()
+        except AuthenticationError as exception:
+            self._set_login_backoff(exception)
+            await self._reset_session()
+            raise
+        except ProteusConnectionError as exception:
+            if renewing and self.expires_at is not None and time() < self.expires_at:
+                # The current session is still valid, try renewing it later.
+                _LOGGER.warning(
+                    "Failed to renew API session for %s, keeping the current one: %s",
+                    self.email,
+                    exception,
+                )
+                self.renew_at = min(time() + UPDATE_INTERVAL, self.expires_at)
+                return cast(aiohttp.ClientSession, self.session)
+            await self._reset_session()
+            raise
+
+        if self._rejected_login_at is None:
+            # Sessions rejected right after their login keep the backoff
+            # escalating until a session is accepted again
+            self.reset_login_backoff()
+        self.authenticated_at = time()
+        await self._share()
+        return cast(aiohttp.ClientSession, self.session)
+
+    async def expire_session(self, session: aiohttp.ClientSession | None) -> bool:
+        """Require a new login after the server rejected a session.
+
+        Returns whether the rejected request may be replayed. Rejections of a
+        session that has already been replaced are ignored, so concurrent
+        requests failing on the same session share one login. A session
+        rejected right after its login is not renewed again, and the next
+        login is delayed with the same backoff as rejected credentials.
+        """
+        if session is None or session is not self.session:
+            return session is not None
+        if self.login_required:
+            return True
+        if (
+            self.authenticated_at is not None
+            and time() - self.authenticated_at < SESSION_RELOGIN_MIN_INTERVAL
+        ):
+            if self._rejected_login_at != self.authenticated_at:
+                self._rejected_login_at = self.authenticated_at
+                self._set_login_backoff(
+                    AuthenticationError("API session was rejected after login")
+                )
+            return False
+
+        if self._rejected_login_at not in (None, self.authenticated_at):
+            # The last login was accepted for a while
+            self.reset_login_backoff()
+        _LOGGER.debug("API session for %s was rejected, logging in again", self.email)
+        self.login_required = True
+        if self.cookie_store is not None:
+            await self.cookie_store.async_remove_cookies(self.key)
+        return True
+
+    def _set_login_backoff(self, exception: AuthenticationError) -> None:
+        """Delay the next login attempt after rejected credentials."""
+        self._login_failures += 1
+        delay = min(
+            LOGIN_BACKOFF_MAX,
+            LOGIN_BACKOFF_INITIAL * 2 ** (self._login_failures - 1),
+        )
+        self._login_blocked_until = time() + delay
+        self._last_login_error = exception
+        _LOGGER.debug(
+            "Login for %s failed %s times, next attempt in %s seconds",
+            self.email,
+            self._login_failures,
+            delay,
+        )
+
+    def _set_expiry(self, expires: float | None) -> None:
+        """Remember when the session expires and when to renew it.
+
+        Short-lived sessions are renewed halfway through their remaining
+        lifetime instead of SESSION_RENEW_MARGIN before they expire.
+        """
+        self.expires_at = expires
+        if expires is None:
+            self.renew_at = None
+            return
+        margin = min(SESSION_RENEW_MARGIN, max(expires - time(), 0) / 2)
+        self.renew_at = expires - margin
+
+    async def _login(self) -> None:
+        """Authenticate the current session with email and password."""
+        payload = {
+            "json": {
+                "tenantId": self.tenant,
+                "email": self.email,
+                "password": self.password,
             }
+        }
 
-            # Authenticate
-            try:
-                async with self._session.post(
-                    f"{API_BASE_URL}{API_LOGIN_ENDPOINT}",
-                    json=payload,
-                ) as response:
-                    if response.status != 200:
-                        await self._raise_login_error(response)
-            except (AuthenticationError, ProteusConnectionError):
-                raise
-            except (aiohttp.ClientError, OSError) as exception:
-                await self._reset_session()
-                raise ProteusConnectionError(
-                    format_connection_error(exception)
-                ) from exception
+        try:
+            async with cast(aiohttp.ClientSession, self.session).post(
+                f"{API_BASE_URL}{API_LOGIN_ENDPOINT}",
+                json=payload,
+                headers=self.get_headers(),
+            ) as response:
+                if response.status != 200:
+                    await self._raise_login_error(response)
+                expires = get_cookie_expiry(response.cookies, time())
+        except (AuthenticationError, ProteusConnectionError):
+            raise
+        except (aiohttp.ClientError, OSError) as exception:
+            raise ProteusConnectionError(
+                format_connection_error(exception)
+            ) from exception
+
+        self._set_expiry(expires)
+        await self._save_cookies(expires)
+
+    async def _save_cookies(self, expires: float | None) -> None:
+        """Persist the cookies of a freshly authenticated session."""
+        if self.cookie_store is None or self.session is None:
+            return
+        cookies = {
+            name: morsel.value
+            for name, morsel in self.session.cookie_jar.filter_cookies(API_URL).items()
+        }
+        if CSRF_COOKIE not in cookies:
+            return
+        await self.cookie_store.async_save_cookies(
+            self.key, {"cookies": cookies, "expires": expires}
+        )
+
+    async def _restore_cookies(self) -> bool:
+        """Restore persisted cookies into the session if the server accepts them."""
+        if not self.shared or self.cookie_store is None or self.session is None:
+            return False
+        stored = await self.cookie_store.async_load_cookies(self.key)
+        if not stored:
+            return False
+
+        cookies = stored.get("cookies")
+        expires = stored.get("expires")
+        if not isinstance(cookies, dict) or CSRF_COOKIE not in cookies:
+            return False
+        if is_number(expires) and expires - PERSISTED_COOKIE_EXPIRY_MARGIN <= time():
+            _LOGGER.debug("Persisted session for %s has expired", self.email)
+            await self.cookie_store.async_remove_cookies(self.key)
+            return False
+
+        self.session.cookie_jar.update_cookies(cookies, API_URL)
+        if await self._validate_session():
+            _LOGGER.debug("Restored persisted session for %s", self.email)
+            self._set_expiry(expires if is_number(expires) else None)
+            return True
+
+        _LOGGER.debug("Persisted session for %s was rejected", self.email)
+        self.session.cookie_jar.clear()
+        await self.cookie_store.async_remove_cookies(self.key)
+        return False
+
+    async def _validate_session(self) -> bool:
+        """Check whether the server accepts the current session cookies."""
+        try:
+            async with self.session.get(
+                f"{API_BASE_URL}{API_LIST_ENDPOINT}",
+                params=INVERTER_LIST_PARAMS,
+                headers=self.get_headers(),
+            ) as response:
+                response_text = await response.text()
+        except (aiohttp.ClientError, OSError) as exception:
+            await self._reset_session()
+            raise ProteusConnectionError(
+                format_connection_error(exception)
+            ) from exception
 
-        return self._session
+        if response.status != 200:
+            return False
+        return not extract_trpc_error_messages(parse_response_body(response_text))
 
     async def _raise_login_error(self, response: aiohttp.ClientResponse) -> None:
         """Raise the appropriate exception for a failed login response."""
         if response.status == 401:
-            await self._log_error(response)
-            await self._reset_session()
+            await log_response_error(response)
             raise AuthenticationError("Invalid email or password")
 
-        error_message = await self._extract_error_message(response)
-        await self._log_error(response)
-        await self._reset_session()
+        error_message = await extract_error_message(response)
+        await log_response_error(response)
         if response.status == 400:
             raise AuthenticationError(
                 error_message or f"Authentication failed (HTTP {response.status})"
@@ -692,55 +1602,152 @@ class ProteusAPI:
             or f"Failed to connect to Proteus API (HTTP {response.status})"
         )
 
+    async def _close_session(self, session: aiohttp.ClientSession) -> None:
+        """Close a session without closing a connector shared with others."""
+        if self.session_factory is not None:
+            session.detach()
+        else:
+            await session.close()
+
     async def _reset_session(self) -> None:
         """Close and discard the current session after login failures."""
-        if self._session is not None:
-            await self._session.close()
-            self._session = None
+        self._set_expiry(None)
+        if self.session is not None:
+            await self._close_session(self.session)
+            self.session = None
 
-    async def _get_client(self) -> RetryClient:
-        session = await self._get_session()
-        retry_options = ExponentialRetry(
+    async def close(self) -> None:
+        """Close the session."""
+        if self._handover_handle is not None:
+            self._handover_handle.cancel()
+            self._handover_handle = None
+        if self._login_task is not None:
+            self._login_task.cancel()
+            self._login_task = None
+        self._set_expiry(None)
+        if self.session and not self.session.closed:
+            _LOGGER.debug("Closing session for %s / %s", self.tenant, self.email)
+            await self._close_session(self.session)
+        self.session = None
+
+
+class ProteusAPI:
+    """Proteus API client."""
+
+    _rate_limited_until_by_scope: ClassVar[dict[tuple[str, str, str], float]] = {}
+    _next_rate_limit_error_by_scope: ClassVar[dict[tuple[str, str, str], float]] = {}
+
+    def __init__(
+        self,
+        inverter_id: str,
+        email: str,
+        password: str,
+        tenant: str = TID_DELTA_GREEN,
+        *,
+        cookie_store: CookieStore | None = None,
+        cooldown_store: CooldownStore | None = None,
+        connector_profile: ConnectorProfile | None = None,
+        session_factory: SessionFactory | None = None,
+        combine_price_fetch: bool = True,
+        verify_credentials: bool = False,
+    ) -> None:
+        """Initialize the API client.
+
+        With ``combine_price_fetch`` due price refreshes are sent in the same
+        tRPC batch as the status procedures. With ``verify_credentials`` the
+        client logs in with its password instead of joining an authenticated
+        session of the account.
+        """
+        self.inverter_id = inverter_id
+        self.email = email
+        self.password = password
+        self.tenant = tenant
+        self.combine_price_fetch = combine_price_fetch
+        self._account = ProteusAccountSession.acquire(
+            email,
+            password,
+            tenant,
+            cookie_store=cookie_store,
+            cooldown_store=cooldown_store,
+            connector_profile=connector_profile,
+            session_factory=session_factory,
+            verify_credentials=verify_credentials,
+        )
+        self._closed = False
+        self._retry_options = ExponentialRetry(
             factor=2,
             attempts=10,
             max_timeout=UPDATE_INTERVAL,
             exceptions={ConnectionError, ClientConnectionError, TimeoutError},
         )
-        return RetryClient(client_session=session, retry_options=retry_options)
+        self._client: RetryClient | None = None
+        self._client_session: aiohttp.ClientSession | None = None
+        self._last_data: dict[str, Any] | None = None
+        self._endpoint_cache: dict[str, CachedEndpoint] = {}
+        self._next_endpoint_update: dict[str, float] = {}
+        self._next_price_update = 0.0
+        self._price_task: asyncio.Task[None] | None = None
+        self._next_command_boundary: float | None = None
+        self._stale_endpoints: set[str] = set()
+        self._cache_changed = False
+        self._account_key = self._account.key
+
+    @property
+    def request_stats(self) -> ProteusRequestStats:
+        """Return request counters of the shared account session."""
+        return self._account.stats
+
+    @property
+    def rate_limiter(self) -> ProteusRateLimiter:
+        """Return the request budget of the shared account session."""
+        return self._account.rate_limiter
+
+    @property
+    def connector_profile(self) -> ConnectorProfile | None:
+        """Return the connector profile, None when using a shared connector."""
+        if self._account.session_factory is not None:
+            return None
+        return self._account.connector_profile
+
+    @property
+    def _session(self) -> aiohttp.ClientSession | None:
+        """Return the shared account session if one is open."""
+        return self._account.session
+
+    def get_headers(self, *, for_post: bool = False) -> dict[str, str]:
+        """Build HTTP headers for the next request.
+
+        Includes CSRF header if session is open.
+        """
+        return self._account.get_headers(for_post=for_post)
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared account session, logging in when needed."""
+        return await self._account.get_session()
+
+    async def _get_client(self) -> RetryClient:
+        """Return the retry client bound to the current account session.
+
+        The client is reused for the lifetime of the session and rebuilt only
+        when the account session was replaced, e.g. after a new login.
+        """
+        session = await self._get_session()
+        if self._client is None or self._client_session is not session:
+            self._client = RetryClient(
+                client_session=session, retry_options=self._retry_options
+            )
+            self._client_session = session
+        return self._client
 
     async def _extract_error_message(
         self, response: aiohttp.ClientResponse
     ) -> str | None:
         """Extract error message from API response body."""
-        try:
-            data = await response.json()
-            return data["error"]["json"]["message"]
-        except (aiohttp.ContentTypeError, JSONDecodeError, KeyError, TypeError):
-            return None
+        return await extract_error_message(response)
 
     def _parse_response_body(self, response_text: str) -> Any | None:
         """Parse JSON or JSONL response body if possible."""
-        if not response_text:
-            return None
-        try:
-            return json.loads(response_text)
-        except JSONDecodeError:
-            pass
-
-        lines = [line.strip() for line in response_text.splitlines() if line.strip()]
-        if not lines:
-            return None
-
-        parsed_lines = []
-        for line in lines:
-            try:
-                parsed_lines.append(json.loads(line))
-            except JSONDecodeError:
-                return None
-
-        if len(parsed_lines) == 1:
-            return parsed_lines[0]
-        return parsed_lines
+        return parse_response_body(response_text)
 
     def _iter_trpc_errors(self, payload: Any):
         """Yield top-level tRPC error objects from a response payload."""
@@ -809,23 +1816,8 @@ class ProteusAPI:
         return True
 
     async def _log_error(self, response: aiohttp.ClientResponse) -> None:
-        try:
-            data = await response.json()
-        except (aiohttp.ContentTypeError, JSONDecodeError):
-            _LOGGER.error(
-                "API %s request %s failed with status %s",
-                response.method,
-                response.url,
-                response.status,
-            )
-        else:
-            _LOGGER.error(
-                "API %s request %s failed with status %s (%s)",
-                response.method,
-                response.url,
-                response.status,
-                data,
-            )
+        """Log a failed API response."""
+        await log_response_error(response)
 
     def _rate_limit_key(self, scope: str) -> tuple[str, str, str]:
         """Return the shared rate-limit key for an account and endpoint scope."""
@@ -847,7 +1839,9 @@ class ProteusAPI:
         self, retry_after: int, scopes: tuple[str, ...]
     ) -> None:
         """Remember the server-requested rate-limit cooldown."""
-        rate_limited_until = monotonic() + retry_after
+        now = monotonic()
+        evict_expired(self._rate_limited_until_by_scope, now)
+        rate_limited_until = now + retry_after
         for scope in scopes:
             rate_limit_key = self._rate_limit_key(scope)
             self._rate_limited_until_by_scope[rate_limit_key] = max(
@@ -855,6 +1849,49 @@ class ProteusAPI:
                 rate_limited_until,
             )
 
+    async def async_restore_rate_limit_cooldowns(self) -> None:
+        """Restore the persisted rate-limit cooldowns of the account."""
+        cooldown_store = self._account.cooldown_store
+        if cooldown_store is None:
+            return
+        deadlines = await cooldown_store.async_load_cooldowns(self._account_key)
+        wall_now = time()
+        now = monotonic()
+        for scope, deadline in deadlines.items():
+            if not is_number(deadline) or deadline <= wall_now:
+                continue
+            rate_limit_key = self._rate_limit_key(scope)
+            self._rate_limited_until_by_scope[rate_limit_key] = max(
+                self._rate_limited_until_by_scope.get(rate_limit_key, 0.0),
+                now + deadline - wall_now,
+            )
+            _LOGGER.debug(
+                "Restored %s rate-limit cooldown for %s ending in %s seconds",
+                scope,
+                self.email,
+                ceil(deadline - wall_now),
+            )
+
+    async def _save_rate_limit_cooldowns(self) -> None:
+        """Persist the account's cooldowns as wall-clock deadlines."""
+        cooldown_store = self._account.cooldown_store
+        if cooldown_store is None:
+            return
+        wall_now = time()
+        now = monotonic()
+        await cooldown_store.async_save_cooldowns(
+            self._account_key,
+            {
+                scope: ceil(wall_now + rate_limited_until - now)
+                for (
+                    tenant,
+                    email,
+                    scope,
+                ), rate_limited_until in self._rate_limited_until_by_scope.items()
+                if (tenant, email) == self._account_key and rate_limited_until > now
+            },
+        )
+
     def _log_rate_limit(
         self, retry_after: int, error_messages: list[str], scope: str
     ) -> None:
@@ -862,6 +1899,7 @@ class ProteusAPI:
         now = monotonic()
         log_level = logging.DEBUG
         extra = ""
+        evict_expired(self._next_rate_limit_error_by_scope, now)
         rate_limit_key = self._rate_limit_key(scope)
         next_error = self._next_rate_limit_error_by_scope.get(rate_limit_key, 0.0)
         if now >= next_error:
@@ -886,15 +1924,23 @@ class ProteusAPI:
         )
 
     def _build_inverter_batch_params(
-        self, endpoints: tuple[str, ...]
+        self,
+        endpoints: tuple[str, ...],
+        inverter_ids: tuple[str, ...] | None = None,
     ) -> dict[str, str]:
-        """Build batch query params for inverter-scoped tRPC GET requests."""
+        """Build batch query params for inverter-scoped tRPC GET requests.
+
+        ``inverter_ids`` holds the inverter of each batch index and defaults to
+        this client's inverter.
+        """
+        if inverter_ids is None:
+            inverter_ids = (self.inverter_id,) * len(endpoints)
         return {
             "batch": "1",
             "input": json.dumps(
                 {
-                    str(index): {"json": {"inverterId": self.inverter_id}}
-                    for index in range(len(endpoints))
+                    str(index): {"json": {"inverterId": inverter_id}}
+                    for index, inverter_id in enumerate(inverter_ids)
                 }
             ),
         }
@@ -906,8 +1952,72 @@ class ProteusAPI:
         endpoints: tuple[str, ...],
         *,
         scope: str,
+        inverter_ids: tuple[str, ...] | None = None,
     ) -> tuple[Any | None, bool]:
-        """Fetch one tRPC batch and report whether cached data should be kept."""
+        """Fetch one tRPC batch and report whether cached data should be kept.
+
+        Procedures failing with errors other than rate limits are requested
+        again on their own, up to PARTIAL_BATCH_RETRIES times and within the
+        account's request budget. Their results replace the failed ones.
+
+        A batch rejecting the session is replayed once after a new login.
+        """
+        if inverter_ids is None:
+            inverter_ids = (self.inverter_id,) * len(endpoints)
+        session = self._client_session
+        try:
+            payload, keep_cached_data = await self._request_trpc_batch(
+                client, api_endpoint, endpoints, scope=scope, inverter_ids=inverter_ids
+            )
+        except SessionRejectedError:
+            if not await self._account.expire_session(session):
+                raise
+            # Replay the batch once on a freshly authenticated session
+            client = await self._get_client()
+            payload, keep_cached_data = await self._request_trpc_batch(
+                client, api_endpoint, endpoints, scope=scope, inverter_ids=inverter_ids
+            )
+
+        for _ in range(PARTIAL_BATCH_RETRIES):
+            failed = get_failed_procedure_indices(payload)
+            if not failed:
+                break
+            retry_endpoints = tuple(endpoints[index] for index in failed)
+            _LOGGER.debug(
+                "Retrying failed %s for inverter %s",
+                ", ".join(retry_endpoints),
+                self.inverter_id,
+            )
+            try:
+                retry_payload, _ = await self._request_trpc_batch(
+                    client,
+                    ",".join(retry_endpoints),
+                    retry_endpoints,
+                    scope=scope,
+                    inverter_ids=tuple(inverter_ids[index] for index in failed),
+                )
+            except ProteusConnectionError as exception:
+                _LOGGER.debug("Retrying failed procedures failed: %s", exception)
+                break
+            if not isinstance(retry_payload, list):
+                break
+            payload = list(payload)
+            for index, item in zip(failed, retry_payload, strict=False):
+                if get_top_level_trpc_error(item) is None:
+                    payload[index] = item
+
+        return payload, keep_cached_data
+
+    async def _request_trpc_batch(
+        self,
+        client: RetryClient,
+        api_endpoint: str,
+        endpoints: tuple[str, ...],
+        *,
+        scope: str,
+        inverter_ids: tuple[str, ...],
+    ) -> tuple[Any | None, bool]:
+        """Send one tRPC batch request unless rate limits defer it."""
         rate_limit_remaining = self._get_rate_limit_remaining(endpoints)
         if rate_limit_remaining:
             _LOGGER.debug(
@@ -919,10 +2029,20 @@ class ProteusAPI:
             )
             return None, True
 
+        if not self._account.rate_limiter.try_acquire(RATE_LIMIT_WRITE_RESERVE):
+            _LOGGER.debug(
+                "Deferring Proteus API %s refresh for inverter %s; "
+                "client-side request budget is exhausted",
+                scope,
+                self.inverter_id,
+            )
+            return None, True
+
+        cooldowns_changed = False
         try:
             async with client.get(
                 f"{API_BASE_URL}{api_endpoint}",
-                params=self._build_inverter_batch_params(endpoints),
+                params=self._build_inverter_batch_params(endpoints, inverter_ids),
                 headers=self.get_headers(),
             ) as response:
                 response_text = await response.text()
@@ -931,7 +2051,9 @@ class ProteusAPI:
 
                 if response.status == TRPC_RATE_LIMIT_HTTP_STATUS:
                     retry_after = retry_after or UPDATE_INTERVAL
+                    self._account.rate_limiter.on_rate_limited(retry_after)
                     self._set_rate_limit_cooldown(retry_after, endpoints)
+                    cooldowns_changed = True
                     self._log_rate_limit(
                         retry_after,
                         self._extract_trpc_error_messages(payload, endpoints)
@@ -940,6 +2062,11 @@ class ProteusAPI:
                     )
                     return None, True
 
+                if is_session_rejected(response.status, payload):
+                    raise SessionRejectedError(
+                        f"Proteus API rejected the session (HTTP {response.status})"
+                    )
+
                 if response.status not in {200, 207}:
                     _LOGGER.error(
                         "API %s request %s failed with status %s (%s)",
@@ -976,9 +2103,13 @@ class ProteusAPI:
 
                 if rate_limit_error_messages:
                     retry_after = retry_after or UPDATE_INTERVAL
+                    self._account.rate_limiter.on_rate_limited()
                     rate_limit_scopes = tuple(rate_limit_error_endpoints) or endpoints
                     self._set_rate_limit_cooldown(retry_after, rate_limit_scopes)
+                    cooldowns_changed = True
                     self._log_rate_limit(retry_after, rate_limit_error_messages, scope)
+                else:
+                    self._account.rate_limiter.on_success()
 
                 if other_error_messages:
                     _LOGGER.warning(
@@ -995,23 +2126,46 @@ class ProteusAPI:
             raise ProteusConnectionError(
                 format_connection_error(exception)
             ) from exception
+        finally:
+            # Persisted once the response has been released
+            if cooldowns_changed:
+                await self._save_rate_limit_cooldowns()
 
     async def fetch_inverters(self) -> list[InverterDict]:
-        """Fetch list of inverters available in the API."""
+        """Fetch list of inverters available in the API.
+
+        A request rejecting the session is replayed once after a new login,
+        a session rejected again raises AuthenticationError.
+        """
+        client = await self._get_client()
+        session = self._client_session
+        try:
+            return await self._request_inverters(client)
+        except SessionRejectedError as exception:
+            if not await self._account.expire_session(session):
+                raise AuthenticationError(str(exception)) from exception
+
+        # Replay the discovery once on a freshly authenticated session
+        try:
+            return await self._request_inverters(await self._get_client())
+        except SessionRejectedError as exception:
+            raise AuthenticationError(str(exception)) from exception
+
+    async def _request_inverters(self, client: RetryClient) -> list[InverterDict]:
+        """Request the list of inverters once."""
         try:
-            client = await self._get_client()
-            params = {
-                "batch": "1",
-                "input": json.dumps(
-                    {"0": {"json": None, "meta": {"values": ["undefined"]}}}
-                ),
-            }
             async with client.get(
                 f"{API_BASE_URL}{API_LIST_ENDPOINT}",
-                params=params,
+                params=INVERTER_LIST_PARAMS,
                 headers=self.get_headers(),
             ) as response:
                 response_text = await response.text()
+                if is_session_rejected(
+                    response.status, self._parse_response_body(response_text)
+                ):
+                    raise SessionRejectedError(
+                        f"Inverter discovery was rejected (HTTP {response.status})"
+                    )
                 if not self._is_successful_trpc_response(
                     response,
                     response_text,
@@ -1056,66 +2210,364 @@ class ProteusAPI:
             error_message or f"Failed to fetch inverters (HTTP {response.status})"
         )
 
+    def get_poll_endpoints(self) -> tuple[str, ...]:
+        """Return the procedures of this inverter's next status batch.
+
+        Only status endpoints whose refresh interval has passed are included.
+        Endpoints cooling down from a rate limit are left out and stay due, so
+        they neither hold back the rest of the batch nor lose their cached
+        data. The price procedure is folded into the batch when its refresh is
+        due and it is not cooling down.
+        """
+        now = monotonic()
+        endpoints = tuple(
+            endpoint
+            for endpoint in API_STATUS_ENDPOINTS
+            if now >= self._next_endpoint_update.get(endpoint, 0.0)
+            and not self._get_rate_limit_remaining((endpoint,))
+        )
+        if (
+            self.combine_price_fetch
+            and now >= self._next_price_update
+            and not self._get_rate_limit_remaining(API_PRICE_ENDPOINTS)
+        ):
+            return (*endpoints, *API_PRICE_ENDPOINTS)
+        return endpoints
+
     async def get_data(self) -> dict[str, Any]:
         """Fetch data from Proteus API."""
 
         client = await self._get_client()
+        endpoints = self.get_poll_endpoints()
+        if API_PRICE_ENDPOINT not in endpoints:
+            self.schedule_price_update()
+        if not endpoints:
+            return self.update_status_data(None, True, endpoints)
 
-        _LOGGER.debug("Fetching status data for %s", self.inverter_id)
+        _LOGGER.debug("Fetching %s for %s", ", ".join(endpoints), self.inverter_id)
         status_payload, keep_cached_status = await self._fetch_trpc_batch(
             client,
-            API_STATUS_ENDPOINT,
-            API_STATUS_ENDPOINTS,
+            ",".join(endpoints),
+            endpoints,
             scope="status",
         )
+
         if status_payload is None and not keep_cached_status:
             raise ProteusConnectionError("Proteus API status data could not be fetched")
 
-        if monotonic() >= self._next_price_update:
-            _LOGGER.debug("Fetching price data for %s", self.inverter_id)
+        return self.update_status_data(status_payload, keep_cached_status, endpoints)
+
+    async def fetch_batch(
+        self, endpoints_by_inverter: Mapping[str, tuple[str, ...]]
+    ) -> tuple[Any | None, bool]:
+        """Fetch the procedures of several inverters in one tRPC batch.
+
+        The inverters must belong to this client's account. The payload holds
+        the results of each inverter's procedures in turn.
+
+        Batches of more than MAX_BATCH_PROCEDURES procedures are sent as
+        several requests. Procedures of a request without results get None in
+        the payload and cached data is kept if any request asked for it.
+        """
+        client = await self._get_client()
+        procedures = [
+            (inverter_id, endpoint)
+            for inverter_id, inverter_endpoints in endpoints_by_inverter.items()
+            for endpoint in inverter_endpoints
+        ]
+
+        _LOGGER.debug("Fetching status data for %s", ", ".join(endpoints_by_inverter))
+        payload: list[Any] = []
+        fetched = False
+        keep_cached_data = False
+        for start in range(0, len(procedures), MAX_BATCH_PROCEDURES):
+            if start:
+                # A replayed request may have switched to a new session
+                client = await self._get_client()
+            chunk = procedures[start : start + MAX_BATCH_PROCEDURES]
+            endpoints = tuple(endpoint for _, endpoint in chunk)
+            chunk_payload, keep_chunk_data = await self._fetch_trpc_batch(
+                client,
+                ",".join(endpoints),
+                endpoints,
+                scope="status",
+                inverter_ids=tuple(inverter_id for inverter_id, _ in chunk),
+            )
+            keep_cached_data = keep_cached_data or keep_chunk_data
+            if not isinstance(chunk_payload, list):
+                chunk_payload = []
+            else:
+                fetched = True
+            payload.extend(chunk_payload[: len(chunk)])
+            payload.extend([None] * (len(chunk) - len(chunk_payload)))
+
+        return (payload if fetched else None), keep_cached_data
+
+    def schedule_price_update(self) -> None:
+        """Refresh due prices in a task the status polls do not wait for.
+
+        A slow or rate-limited price request thus never delays the status.
+        The refreshed prices are part of the snapshot from the next poll on.
+        """
+        if self._closed or monotonic() < self._next_price_update:
+            return
+        if self._price_task is not None and not self._price_task.done():
+            return
+        self._price_task = asyncio.get_running_loop().create_task(
+            self.update_price_data()
+        )
+        self._price_task.add_done_callback(self._log_price_update_error)
+
+    def _log_price_update_error(self, task: asyncio.Task[None]) -> None:
+        """Log unexpected errors of a background price refresh."""
+        if task.cancelled() or (exception := task.exception()) is None:
+            return
+        _LOGGER.error(
+            "Unexpected error refreshing prices of inverter %s",
+            self.inverter_id,
+            exc_info=exception,
+        )
+
+    async def update_price_data(self) -> None:
+        """Refresh the cached distribution prices once they are due.
+
+        Failures keep the cached prices and retry on a later poll.
+        """
+        if monotonic() < self._next_price_update:
+            return
+
+        client = await self._get_client()
+
+        _LOGGER.debug("Fetching price data for %s", self.inverter_id)
+        try:
             price_payload, _ = await self._fetch_trpc_batch(
                 client,
                 API_PRICE_ENDPOINT,
                 API_PRICE_ENDPOINTS,
                 scope=API_PRICE_ENDPOINT,
             )
-            price_data = parse_price_data(price_payload)
-            if price_data:
-                self._last_price_data = price_data
-                self._next_price_update = (
-                    monotonic() + get_seconds_until_next_price_update(time())
+        except ProteusConnectionError as exception:
+            _LOGGER.warning(
+                "Failed to fetch price data for inverter %s, keeping previous "
+                "prices: %s",
+                self.inverter_id,
+                exception,
+            )
+            price_payload = None
+        self._apply_price_payload(price_payload)
+
+    def _apply_price_payload(self, price_payload: Any | None) -> None:
+        """Cache fetched prices and schedule the next price refresh."""
+        price_data = parse_price_data(price_payload)
+        if price_data:
+            self._cache_endpoint(API_PRICE_ENDPOINT, price_data)
+            self._next_price_update = monotonic() + get_seconds_until_next_price_update(
+                time()
+            )
+        else:
+            retry_after = self._get_rate_limit_remaining(API_PRICE_ENDPOINTS)
+            self._next_price_update = monotonic() + (retry_after or UPDATE_INTERVAL)
+
+    def update_status_data(
+        self,
+        status_payload: Any | None,
+        keep_cached_status: bool,
+        endpoints: tuple[str, ...] = API_STATUS_ENDPOINTS,
+    ) -> dict[str, Any]:
+        """Merge the fetched endpoint results into the cached snapshot.
+
+        ``endpoints`` names the procedure of each payload index. Endpoints
+        without a result keep their cached data and stay due for the next poll,
+        a null result clears their cached values.
+        Failed procedures are listed in ``stale_endpoints`` until they succeed.
+        The snapshot is only rebuilt when a cached result changed.
+        """
+        now = monotonic()
+        fetched = False
+        served_stale = False
+        for index, endpoint in enumerate(endpoints):
+            if endpoint == API_PRICE_ENDPOINT:
+                self._apply_price_payload(
+                    status_payload[index : index + 1]
+                    if isinstance(status_payload, list)
+                    else None
                 )
+                continue
+
+            if not has_trpc_result(status_payload, index):
+                if isinstance(status_payload, list) and get_top_level_trpc_error(
+                    status_payload[index] if index < len(status_payload) else None
+                ):
+                    # The procedure failed, its cached result is served stale
+                    self._set_stale(endpoint, True)
+                    served_stale = (
+                        served_stale or self.get_cached_data(endpoint) is not None
+                    )
+                continue
+            self._set_stale(endpoint, False)
+            # A null result clears the endpoint's cached values
+            parsed = self._parse_endpoint_data(
+                endpoint, self._get_trpc_result_json(status_payload, index)
+            )
+            previous = self.get_cached_data(endpoint)
+            self._cache_endpoint(endpoint, parsed)
+            if endpoint in QUARTER_HOUR_ENDPOINTS:
+                next_update = now + get_seconds_until_next_quarter_hour(time())
             else:
-                retry_after = self._get_rate_limit_remaining(API_PRICE_ENDPOINTS)
-                self._next_price_update = monotonic() + (retry_after or UPDATE_INTERVAL)
-
-        data = self._parse_data(status_payload) if status_payload is not None else {}
-        if data:
-            if keep_cached_status and self._last_data is not None:
-                data = {**self._last_data, **data}
-            if self._last_price_data is not None:
-                data = {**data, **self._last_price_data}
+                next_update = now + ENDPOINT_UPDATE_INTERVALS[endpoint]
+            self._next_endpoint_update[endpoint] = next_update
+            if endpoint == "commands.current" and has_command_ended(previous, parsed):
+                _LOGGER.debug("Flexibility command of %s ended", self.inverter_id)
+                self.invalidate(*COMMAND_END_INVALIDATED_ENDPOINTS)
+            if endpoint == "commands.current":
+                self._schedule_command_boundary(parsed, now)
+            fetched = fetched or bool(parsed)
+        self._apply_command_boundary(now)
+
+        requested_status = any(endpoint != API_PRICE_ENDPOINT for endpoint in endpoints)
+        if not (
+            fetched or keep_cached_status or served_stale or not requested_status
+        ) or not any(
+            self.get_cached_data(endpoint) for endpoint in API_STATUS_ENDPOINTS
+        ):
+            # Nothing usable was cached, request every status endpoint again
+            self.invalidate(*API_STATUS_ENDPOINTS)
+            raise ProteusConnectionError(
+                "Proteus API status response did not contain usable data"
+            )
+
+        if self._last_data is None or self._cache_changed:
+            data: dict[str, Any] = {}
+            for endpoint in API_ENDPOINTS:
+                data.update(self.get_cached_data(endpoint) or {})
+            if self._stale_endpoints:
+                data["stale_endpoints"] = sorted(self._stale_endpoints)
             self._last_data = data
-            return data
+            self._cache_changed = False
+            _LOGGER.debug("Parsed status %s", data)
+        return self._last_data
+
+    def _cache_endpoint(self, endpoint: str, data: dict[str, Any]) -> None:
+        """Store a parsed endpoint result with its fetch time."""
+        cached = self._endpoint_cache.get(endpoint)
+        if cached is None or cached["data"] != data:
+            self._cache_changed = True
+        self._endpoint_cache[endpoint] = {"data": data, "fetched_at": time()}
+
+    def _set_stale(self, endpoint: str, stale: bool) -> None:
+        """Mark whether the cached result of an endpoint is served stale."""
+        if stale != (endpoint in self._stale_endpoints):
+            self._cache_changed = True
+            if stale:
+                self._stale_endpoints.add(endpoint)
+            else:
+                self._stale_endpoints.discard(endpoint)
 
-        if keep_cached_status and self._last_data is not None:
-            if self._last_price_data is not None:
-                self._last_data = {**self._last_data, **self._last_price_data}
-            return self._last_data
+    def get_cached_data(self, endpoint: str) -> dict[str, Any] | None:
+        """Return the cached parsed result of an endpoint."""
+        cached = self._endpoint_cache.get(endpoint)
+        return cached["data"] if cached is not None else None
 
-        raise ProteusConnectionError(
-            "Proteus API status response did not contain usable data"
+    def get_fetched_at(self, endpoint: str) -> datetime | None:
+        """Return when the cached result of an endpoint was fetched."""
+        cached = self._endpoint_cache.get(endpoint)
+        if cached is None:
+            return None
+        return datetime.fromtimestamp(cached["fetched_at"], UTC)
+
+    def _schedule_command_boundary(self, command: dict[str, Any], now: float) -> None:
+        """Remember when the parsed command next starts or ends."""
+        seconds = get_seconds_until_command_boundary(command, datetime.now(UTC))
+        self._next_command_boundary = (
+            None if seconds is None else now + seconds + COMMAND_BOUNDARY_DELAY
         )
 
-    def _parse_data(self, raw_data: Any) -> dict[str, Any]:
-        """Parse raw API data into structured format."""
-        return parse_data(raw_data)
+    def _apply_command_boundary(self, now: float) -> None:
+        """Refresh the command outcome right after the next command boundary."""
+        boundary = self._next_command_boundary
+        if boundary is None:
+            return
+        if boundary <= now:
+            self._next_command_boundary = None
+            return
+        for endpoint in COMMAND_BOUNDARY_ENDPOINTS:
+            if endpoint in self._next_endpoint_update:
+                self._next_endpoint_update[endpoint] = min(
+                    self._next_endpoint_update[endpoint], boundary
+                )
+
+    def invalidate(self, *endpoints: str) -> None:
+        """Mark cached endpoint results stale so the next poll fetches them."""
+        for endpoint in endpoints:
+            self._next_endpoint_update.pop(endpoint, None)
+
+    def _parse_endpoint_data(self, endpoint: str, result: Any) -> dict[str, Any]:
+        """Parse the result of one status endpoint."""
+        return parse_endpoint_data(endpoint, result)
+
+    async def _acquire_write_budget(self, operation: str) -> bool:
+        """Wait for the account's request budget before a write."""
+        if await self._account.rate_limiter.acquire(RATE_LIMIT_MAX_WRITE_WAIT):
+            return True
+        _LOGGER.error(
+            "%s skipped; the Proteus API is rate-limiting account requests",
+            operation,
+        )
+        return False
+
+    def _record_write_response(self, status: int, response_text: str) -> None:
+        """Adapt the account's request budget to a write response."""
+        rate_limiter = self._account.rate_limiter
+        retry_after = self._extract_trpc_rate_limit_retry_after(
+            self._parse_response_body(response_text)
+        )
+        if status == TRPC_RATE_LIMIT_HTTP_STATUS:
+            rate_limiter.on_rate_limited(retry_after or UPDATE_INTERVAL)
+        elif retry_after is not None:
+            rate_limiter.on_rate_limited()
+        elif status == 200:
+            rate_limiter.on_success()
+
+    async def _post_mutation(
+        self, endpoint: str, payload: dict[str, Any]
+    ) -> tuple[aiohttp.ClientResponse, str]:
+        """Post a tRPC mutation and return the response and its body.
+
+        A mutation rejecting the session is replayed once after a new login,
+        within the account's request budget like the first request. The caller
+        records the returned response, a replayed one is recorded here.
+        """
+        response, data, session = await self._send_mutation(endpoint, payload)
+        if not is_session_rejected(
+            response.status, self._parse_response_body(data)
+        ) or not await self._account.expire_session(session):
+            return response, data
+        if not await self._acquire_write_budget(f"Replay of {endpoint}"):
+            return response, data
+
+        self._record_write_response(response.status, data)
+        _LOGGER.debug("Replaying %s after a new login", endpoint)
+        response, data, _ = await self._send_mutation(endpoint, payload)
+        return response, data
+
+    async def _send_mutation(
+        self, endpoint: str, payload: dict[str, Any]
+    ) -> tuple[aiohttp.ClientResponse, str, aiohttp.ClientSession | None]:
+        """Post a tRPC mutation once on the current session."""
+        client = await self._get_client()
+        session = self._client_session
+        async with client.post(
+            f"{API_BASE_URL}{endpoint}?batch=1",
+            json=payload,
+            headers=self.get_headers(for_post=True),
+        ) as response:
+            return response, await response.text(), session
 
     async def update_manual_control(self, control_type: str, state: str) -> bool:
         """Update manual control state."""
         try:
-            client = await self._get_client()
-
+            if not await self._acquire_write_budget("Manual control update"):
+                return False
             payload = {
                 "0": {
                     "json": {
@@ -1133,28 +2585,27 @@ class ProteusAPI:
                 payload,
             )
 
-            async with client.post(
-                f"{API_BASE_URL}{API_CONTROL_ENDPOINT}?batch=1",
-                json=payload,
-                headers=self.get_headers(for_post=True),
-            ) as response:
-                data = await response.text()
-                _LOGGER.debug("Response data: %s", data)
-                return self._is_successful_trpc_response(
-                    response,
-                    data,
-                    operation=f"Manual control update for {control_type}",
-                )
-
+            response, data = await self._post_mutation(API_CONTROL_ENDPOINT, payload)
         except Exception:
             _LOGGER.exception("Error updating manual control")
             return False
 
+        self._record_write_response(response.status, data)
+        _LOGGER.debug("Response data: %s", data)
+        success = self._is_successful_trpc_response(
+            response,
+            data,
+            operation=f"Manual control update for {control_type}",
+        )
+        if success:
+            self.invalidate(*WRITE_INVALIDATED_ENDPOINTS[API_CONTROL_ENDPOINT])
+        return success
+
     async def update_control_enabled(self, enabled: bool) -> bool:
         """Update control enabled."""
         try:
-            client = await self._get_client()
-
+            if not await self._acquire_write_budget("Control enabled update"):
+                return False
             payload = {
                 "0": {
                     "json": {
@@ -1165,28 +2616,27 @@ class ProteusAPI:
             }
             _LOGGER.debug("Toggling control for %s to %s", self.inverter_id, enabled)
 
-            async with client.post(
-                f"{API_BASE_URL}{API_ENABLED_ENDPOINT}?batch=1",
-                json=payload,
-                headers=self.get_headers(for_post=True),
-            ) as response:
-                data = await response.text()
-                _LOGGER.debug("Response data: %s", data)
-                return self._is_successful_trpc_response(
-                    response,
-                    data,
-                    operation="Control enabled update",
-                )
-
+            response, data = await self._post_mutation(API_ENABLED_ENDPOINT, payload)
         except Exception:
             _LOGGER.exception("Error updating enabled mode")
             return False
 
+        self._record_write_response(response.status, data)
+        _LOGGER.debug("Response data: %s", data)
+        success = self._is_successful_trpc_response(
+            response,
+            data,
+            operation="Control enabled update",
+        )
+        if success:
+            self.invalidate(*WRITE_INVALIDATED_ENDPOINTS[API_ENABLED_ENDPOINT])
+        return success
+
     async def update_control_mode(self, mode: str) -> bool:
         """Update control mode."""
         try:
-            client = await self._get_client()
-
+            if not await self._acquire_write_budget("Control mode update"):
+                return False
             payload = {
                 "0": {
                     "json": {
@@ -1197,28 +2647,27 @@ class ProteusAPI:
             }
             _LOGGER.debug("Toggling control mode for %s to %s", self.inverter_id, mode)
 
-            async with client.post(
-                f"{API_BASE_URL}{API_MODE_ENDPOINT}?batch=1",
-                json=payload,
-                headers=self.get_headers(for_post=True),
-            ) as response:
-                data = await response.text()
-                _LOGGER.debug("Response data: %s", data)
-                return self._is_successful_trpc_response(
-                    response,
-                    data,
-                    operation="Control mode update",
-                )
-
+            response, data = await self._post_mutation(API_MODE_ENDPOINT, payload)
         except Exception:
             _LOGGER.exception("Error updating control mode")
             return False
 
+        self._record_write_response(response.status, data)
+        _LOGGER.debug("Response data: %s", data)
+        success = self._is_successful_trpc_response(
+            response,
+            data,
+            operation="Control mode update",
+        )
+        if success:
+            self.invalidate(*WRITE_INVALIDATED_ENDPOINTS[API_MODE_ENDPOINT])
+        return success
+
     async def update_flexibility_mode(self, mode: list[str]) -> bool:
         """Update flexibility mode."""
         try:
-            client = await self._get_client()
-
+            if not await self._acquire_write_budget("Flexibility mode update"):
+                return False
             payload = {
                 "0": {
                     "json": {
@@ -1231,25 +2680,92 @@ class ProteusAPI:
                 "Toggling flexibility mode for %s to %s", self.inverter_id, mode
             )
 
-            async with client.post(
-                f"{API_BASE_URL}{API_FLEXIBILITY_ENDPOINT}?batch=1",
-                json=payload,
-                headers=self.get_headers(for_post=True),
-            ) as response:
-                data = await response.text()
-                _LOGGER.debug("Response data: %s", data)
-                return self._is_successful_trpc_response(
-                    response,
-                    data,
-                    operation="Flexibility mode update",
-                )
-
+            response, data = await self._post_mutation(
+                API_FLEXIBILITY_ENDPOINT, payload
+            )
         except Exception:
             _LOGGER.exception("Error updating flexibility mode")
             return False
 
-    async def close(self) -> None:
-        """Close the session."""
-        if self._session and not self._session.closed:
-            _LOGGER.debug("Closing session for %s", self.inverter_id)
-            await self._session.close()
+        self._record_write_response(response.status, data)
+        _LOGGER.debug("Response data: %s", data)
+        success = self._is_successful_trpc_response(
+            response,
+            data,
+            operation="Flexibility mode update",
+        )
+        if success:
+            self.invalidate(*WRITE_INVALIDATED_ENDPOINTS[API_FLEXIBILITY_ENDPOINT])
+        return success
+
+    async def close(self, *, handover: bool = False) -> None:
+        """Release this client's reference to the shared account session.
+
+        With ``handover`` the authenticated session is kept open for clients
+        of the same account created shortly after.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._price_task is not None:
+            self._price_task.cancel()
+            self._price_task = None
+        self._client = None
+        self._client_session = None
+        _LOGGER.debug("Releasing account session for %s", self.inverter_id)
+        await self._account.release(handover=handover)
+
+
+class ProteusFleetAPI:
+    """Fetch the status of all inverters of one account in a single tRPC batch."""
+
+    def __init__(self, apis: Mapping[str, ProteusAPI]) -> None:
+        """Initialize with the API clients of the account's inverters."""
+        self.apis = dict(apis)
+
+    async def get_data(self) -> dict[str, dict[str, Any] | Exception]:
+        """Fetch data for every inverter.
+
+        Failures affecting the whole batch are raised, failures of single
+        inverters are returned in place of their data.
+        """
+        endpoints_by_inverter = {
+            inverter_id: api.get_poll_endpoints()
+            for inverter_id, api in self.apis.items()
+        }
+        batch = {
+            inverter_id: endpoints
+            for inverter_id, endpoints in endpoints_by_inverter.items()
+            if endpoints
+        }
+        # Prices not folded into the batch are refreshed in the background
+        for inverter_id, api in self.apis.items():
+            if API_PRICE_ENDPOINT not in endpoints_by_inverter[inverter_id]:
+                api.schedule_price_update()
+        status_payload, keep_cached_status = (
+            await next(iter(self.apis.values())).fetch_batch(batch)
+            if batch
+            else (None, True)
+        )
+        if status_payload is None and not keep_cached_status:
+            raise ProteusConnectionError("Proteus API status data could not be fetched")
+        if not isinstance(status_payload, list):
+            status_payload = None
+
+        results: dict[str, dict[str, Any] | Exception] = {}
+        offset = 0
+        for inverter_id, api in self.apis.items():
+            endpoints = endpoints_by_inverter[inverter_id]
+            inverter_payload = (
+                status_payload[offset : offset + len(endpoints)]
+                if status_payload is not None
+                else None
+            )
+            offset += len(endpoints)
+            try:
+                results[inverter_id] = api.update_status_data(
+                    inverter_payload, keep_cached_status, endpoints
+                )
+            except ProteusConnectionError as exception:
+                results[inverter_id] = exception
+        return results
@@ -0,0 +1,176 @@
+"""Poll scheduling policies for the Proteus API integration."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from itertools import pairwise
+from random import uniform
+from typing import Any
+
+from .const import COMMAND_NONE, PRICE_UPDATE_INTERVAL
+
+COMMAND_BOUNDARY_FIELDS = ("command_start", "command_end", "command_effective_end")
+
+
+def _get_seconds_until(
+    snapshot: dict[str, Any], field: str, now: datetime
+) -> float | None:
+    """Return the seconds until a datetime field, naive ones being UTC."""
+    value = snapshot.get(field)
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return (value - now).total_seconds()
+
+
+def get_seconds_until_command_boundary(
+    snapshot: dict[str, Any], now: datetime
+) -> float | None:
+    """Return the seconds until the next start or end of the current command."""
+    seconds = [
+        _get_seconds_until(snapshot, field, now) for field in COMMAND_BOUNDARY_FIELDS
+    ]
+    return min(
+        (second for second in seconds if second is not None and second > 0),
+        default=None,
+    )
+
+
+def is_command_pending(snapshot: dict[str, Any], now: datetime, horizon: float) -> bool:
+    """Return whether a command is active or starts within the horizon."""
+    if snapshot.get("current_command") not in (None, COMMAND_NONE):
+        return True
+
+    seconds = _get_seconds_until(snapshot, "command_start", now)
+    return seconds is not None and seconds <= horizon
+
+
+def get_adaptive_update_interval(
+    snapshots: Sequence[dict[str, Any]],
+    previous_snapshots: Sequence[dict[str, Any]] | None,
+    interval: float,
+    *,
+    floor: float,
+    ceiling: float,
+    now: datetime,
+) -> float:
+    """Return the seconds until the next poll.
+
+    Polls at the floor while a command is active or about to start and right
+    after the data changed, then doubles the interval up to the ceiling for
+    as long as nothing changes.
+    """
+    if (
+        previous_snapshots is None
+        or list(snapshots) != list(previous_snapshots)
+        or any(is_command_pending(snapshot, now, ceiling) for snapshot in snapshots)
+    ):
+        return floor
+    return min(max(interval, floor) * 2, ceiling)
+
+
+def get_quarter_hour_aligned_interval(
+    interval: float, now: float, *, floor: float, window: float
+) -> float:
+    """Align an interval to the quarter-hour market intervals.
+
+    Polls at the floor during the window right after each quarter-hour
+    boundary, when commands and the current step flip, and never sleeps past
+    the start of the next window.
+    """
+    seconds_since_boundary = now % PRICE_UPDATE_INTERVAL
+    if seconds_since_boundary < window:
+        return floor
+    return min(interval, PRICE_UPDATE_INTERVAL - seconds_since_boundary)
+
+
+def get_command_boundary_interval(
+    snapshots: Sequence[dict[str, Any]],
+    interval: float,
+    now: datetime,
+    *,
+    delay: float,
+) -> float:
+    """Shorten an interval to poll right after the next command boundary."""
+    for snapshot in snapshots:
+        seconds = get_seconds_until_command_boundary(snapshot, now)
+        if seconds is not None:
+            interval = min(interval, seconds + delay)
+    return interval
+
+
+def get_phase_aligned_interval(
+    interval: float, now: float, *, period: float, phase: float, jitter: float
+) -> float:
+    """Delay a poll to the next time at the given phase of the period.
+
+    Polls are only moved later, and the jitter never takes them below the
+    requested interval, so the interval stays a floor.
+    """
+    offset = (phase - now - interval) % period
+    return max(interval + offset + jitter, interval)
+
+
+class PollScheduler:
+    """Spread the polls of all accounts evenly over the poll period.
+
+    Each registered account gets its own phase within the period. Its polls
+    are delayed to the next time at that phase, plus a bounded random
+    jitter, so the accounts do not hit the API in synchronized bursts.
+    """
+
+    def __init__(self, period: float, jitter: float) -> None:
+        """Initialize."""
+        self.period = period
+        self.jitter = jitter
+        self._next_polls: dict[str, float | None] = {}
+
+    def register(self, account: str) -> None:
+        """Add an account to the schedule."""
+        self._next_polls.setdefault(account, None)
+
+    def unregister(self, account: str) -> None:
+        """Remove an account from the schedule."""
+        self._next_polls.pop(account, None)
+
+    def get_phase(self, account: str) -> float:
+        """Return the phase of a registered account within the period."""
+        return (
+            list(self._next_polls).index(account) * self.period / len(self._next_polls)
+        )
+
+    def get_interval(self, account: str, interval: float, now: float) -> float:
+        """Return an interval moved to the account's phase."""
+        self.register(account)
+        return get_phase_aligned_interval(
+            interval,
+            now,
+            period=self.period,
+            phase=self.get_phase(account),
+            jitter=uniform(-self.jitter, self.jitter),
+        )
+
+    def set_next_poll(self, account: str, when: float) -> None:
+        """Record when an account polls next."""
+        if account in self._next_polls:
+            self._next_polls[account] = when
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        """Return the spread of the scheduled polls for diagnostics."""
+        next_polls = sorted(
+            when - now for when in self._next_polls.values() if when is not None
+        )
+        offsets = sorted(delay % self.period for delay in next_polls)
+        gaps = [later - earlier for earlier, later in pairwise(offsets)]
+        if offsets:
+            gaps.append(offsets[0] + self.period - offsets[-1])
+        return {
+            "period": self.period,
+            "jitter": self.jitter,
+            "accounts": len(self._next_polls),
+            "phases": [self.get_phase(account) for account in self._next_polls],
+            "next_polls": [round(delay, 3) for delay in next_polls],
+            "min_gap": round(min(gaps), 3) if len(gaps) > 1 else None,
+        }
@@ -12,14 +12,14 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfEnergy
+from homeassistant.const import EntityCategory, UnitOfEnergy
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.event import async_track_point_in_time
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
-from .const import COMMAND_NONE, DISTRIBUTION_TARIFF_TYPES, DOMAIN
+from .const import API_ENDPOINTS, COMMAND_NONE, DISTRIBUTION_TARIFF_TYPES, DOMAIN
 from .entity import build_device_info
 
 _LOGGER = logging.getLogger(__name__)
@@ -36,6 +36,7 @@ async def async_setup_entry(
     sensors = []
     for inverter_id, inverter_info in inverters_data.items():
         coordinator = inverter_info["coordinator"]
+        api = inverter_info["api"]
         inverter = inverter_info["inverter"]
 
         sensors.extend(
@@ -88,6 +89,9 @@ async def async_setup_entry(
                 ProteusDistributionTariffTypeSensor(
                     coordinator, config_entry, inverter_id, inverter
                 ),
+                ProteusDataFetchedSensor(
+                    coordinator, config_entry, api, inverter_id, inverter
+                ),
             ]
         )
 
@@ -714,3 +718,41 @@ class ProteusDistributionTariffTypeSensor(ProteusBaseSensor):
         if tariff_type is None:
             return None
         return str(tariff_type)
+
+
+class ProteusDataFetchedSensor(ProteusBaseSensor):
+    """Fetch time of the oldest cached endpoint result."""
+
+    _attr_translation_key = "data_fetched"
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_icon = "mdi:clock-check-outline"
+
+    def __init__(self, coordinator, config_entry, api, inverter_id, inverter):
+        """Initialize the sensor."""
+        super().__init__(coordinator, config_entry, inverter_id, inverter)
+        self._api = api
+        self._attr_unique_id = self._get_unique_id("proteus_data_fetched")
+
+    def _get_fetch_times(self) -> dict[str, datetime]:
+        """Return the fetch time of each cached endpoint result."""
+        fetch_times = {}
+        for endpoint in API_ENDPOINTS:
+            fetched_at = self._api.get_fetched_at(endpoint)
+            if fetched_at is not None:
+                fetch_times[endpoint] = fetched_at
+        return fetch_times
+
+    @property
+    def native_value(self) -> datetime | None:
+        """Return when the oldest cached result was fetched."""
+        return min(self._get_fetch_times().values(), default=None)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the fetch time of each endpoint and stale endpoints."""
+        attributes: dict[str, Any] = dict(self._get_fetch_times())
+        if self.coordinator.data and self.coordinator.data.get("stale_endpoints"):
+            attributes["stale_endpoints"] = self.coordinator.data["stale_endpoints"]
+        return attributes or None
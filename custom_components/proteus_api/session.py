@@ -0,0 +1,27 @@
+"""Home Assistant HTTP session helpers for Proteus API."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+
+from .proteus_api import SessionFactory
+
+
+@callback
+def async_get_session_factory(hass: HomeAssistant) -> SessionFactory:
+    """Return a factory for account sessions on Home Assistant's shared connector.
+
+    Each account still gets its own session and cookie jar, only the TCP/TLS
+    connection pool is shared with the rest of Home Assistant. The account
+    session detaches its session itself, so automatic cleanup is disabled.
+    """
+
+    def create_session(**kwargs: Any) -> aiohttp.ClientSession:
+        return async_create_clientsession(hass, auto_cleanup=False, **kwargs)
+
+    return create_session
@@ -0,0 +1,199 @@
+"""Persistent storage for the Proteus API integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.singleton import singleton
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+COOKIE_STORAGE_KEY = f"{DOMAIN}.cookies"
+INVERTER_STORAGE_KEY = f"{DOMAIN}.inverters"
+COOLDOWN_STORAGE_KEY = f"{DOMAIN}.cooldowns"
+# Seconds cooldown changes are collected before they are written, so bursts
+# of rate limits cause a single write
+COOLDOWN_SAVE_DELAY = 10
+
+# Inverter attributes kept from the discovery response
+CACHED_INVERTER_FIELDS = (
+    "id",
+    "vendor",
+    "featureFlags",
+    "controlMode",
+    "controlEnabled",
+)
+
+
+def _get_account_storage_key(account_key: tuple[str, str]) -> str:
+    """Return the storage key for an account."""
+    tenant, email = account_key
+    return f"{tenant}/{email}"
+
+
+class _ProteusStore:
+    """Keyed JSON store loaded lazily on first use."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        key: str,
+        *,
+        private: bool,
+        save_delay: float | None = None,
+    ) -> None:
+        """Initialize the store.
+
+        With ``save_delay`` changes are written after that many seconds, and
+        at the latest when Home Assistant stops, instead of right away.
+        """
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, key, private=private
+        )
+        self._data: dict[str, Any] | None = None
+        self._save_delay = save_delay
+
+    async def _async_get_data(self) -> dict[str, Any]:
+        """Load stored data on first use."""
+        if self._data is None:
+            self._data = await self._store.async_load() or {}
+        return self._data
+
+    async def _async_get(self, key: str) -> Any:
+        """Return the stored value for a key."""
+        data = await self._async_get_data()
+        return data.get(key)
+
+    async def _async_set(self, key: str, value: Any) -> None:
+        """Store a value, writing to disk only if it changed."""
+        stored = await self._async_get_data()
+        if stored.get(key) == value:
+            return
+        stored[key] = value
+        await self._async_save(stored)
+
+    async def _async_remove(self, key: str) -> None:
+        """Forget the stored value for a key."""
+        stored = await self._async_get_data()
+        if stored.pop(key, None) is not None:
+            await self._async_save(stored)
+
+    async def _async_save(self, stored: dict[str, Any]) -> None:
+        """Write the stored data, delayed if configured."""
+        if self._save_delay is None:
+            await self._store.async_save(stored)
+        else:
+            self._store.async_delay_save(lambda: stored, self._save_delay)
+
+
+class ProteusCookieStore(_ProteusStore):
+    """Persist authenticated session cookies per Proteus account."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cookie store."""
+        super().__init__(hass, COOKIE_STORAGE_KEY, private=True)
+
+    async def async_load_cookies(
+        self, account_key: tuple[str, str]
+    ) -> dict[str, Any] | None:
+        """Return the stored cookies for an account."""
+        return await self._async_get(_get_account_storage_key(account_key))
+
+    async def async_save_cookies(
+        self, account_key: tuple[str, str], data: dict[str, Any]
+    ) -> None:
+        """Store cookies for an account."""
+        await self._async_set(_get_account_storage_key(account_key), data)
+
+    async def async_remove_cookies(self, account_key: tuple[str, str]) -> None:
+        """Forget stored cookies for an account."""
+        await self._async_remove(_get_account_storage_key(account_key))
+
+
+class ProteusInverterStore(_ProteusStore):
+    """Persist the last discovered inverter list per config entry."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the inverter store."""
+        super().__init__(hass, INVERTER_STORAGE_KEY, private=False)
+
+    async def async_load_inverters(self, entry_id: str) -> list[dict[str, Any]]:
+        """Return the cached inverters of a config entry."""
+        return await self._async_get(entry_id) or []
+
+    async def async_save_inverters(
+        self, entry_id: str, inverters: list[dict[str, Any]]
+    ) -> None:
+        """Cache the discovered inverters of a config entry."""
+        await self._async_set(
+            entry_id,
+            [
+                {
+                    field: inverter[field]
+                    for field in CACHED_INVERTER_FIELDS
+                    if field in inverter
+                }
+                for inverter in inverters
+            ],
+        )
+
+    async def async_remove_inverters(self, entry_id: str) -> None:
+        """Forget the cached inverters of a config entry."""
+        await self._async_remove(entry_id)
+
+
+class ProteusCooldownStore(_ProteusStore):
+    """Persist rate-limit cooldowns per Proteus account.
+
+    Cooldowns are stored as wall-clock deadlines by endpoint scope, so they
+    survive restarts.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cooldown store."""
+        super().__init__(
+            hass, COOLDOWN_STORAGE_KEY, private=False, save_delay=COOLDOWN_SAVE_DELAY
+        )
+
+    async def async_load_cooldowns(
+        self, account_key: tuple[str, str]
+    ) -> dict[str, float]:
+        """Return the stored cooldown deadlines of an account."""
+        return await self._async_get(_get_account_storage_key(account_key)) or {}
+
+    async def async_save_cooldowns(
+        self, account_key: tuple[str, str], cooldowns: dict[str, float]
+    ) -> None:
+        """Store the cooldown deadlines of an account."""
+        if not cooldowns:
+            await self.async_remove_cooldowns(account_key)
+            return
+        await self._async_set(_get_account_storage_key(account_key), cooldowns)
+
+    async def async_remove_cooldowns(self, account_key: tuple[str, str]) -> None:
+        """Forget the stored cooldowns of an account."""
+        await self._async_remove(_get_account_storage_key(account_key))
+
+
+@singleton(f"{DOMAIN}_cookie_store")
+@callback
+def async_get_cookie_store(hass: HomeAssistant) -> ProteusCookieStore:
+    """Return the shared cookie store."""
+    return ProteusCookieStore(hass)
+
+
+@singleton(f"{DOMAIN}_inverter_store")
+@callback
+def async_get_inverter_store(hass: HomeAssistant) -> ProteusInverterStore:
+    """Return the shared inverter store."""
+    return ProteusInverterStore(hass)
+
+
+@singleton(f"{DOMAIN}_cooldown_store")
+@callback
+def async_get_cooldown_store(hass: HomeAssistant) -> ProteusCooldownStore:
+    """Return the shared cooldown store."""
+    return ProteusCooldownStore(hass)
@@ -8,6 +8,7 @@ import pytest
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.proteus_api.const import DOMAIN
+from custom_components.proteus_api.storage import async_get_inverter_store
 
 
 @pytest.mark.asyncio
@@ -22,6 +23,8 @@ async def test_updates_unique_id_when_email_changes(
         title="Proteus API (old@example.com)",
     )
     entry.add_to_hass(hass)
+    store = async_get_inverter_store(hass)
+    await store.async_save_inverters(entry.entry_id, [{"id": "inv-old"}])
 
     monkeypatch.setattr(
         "custom_components.proteus_api.config_flow.validate_input",
@@ -45,6 +48,8 @@ async def test_updates_unique_id_when_email_changes(
     assert entry.data["password"] == "updated"
     assert entry.unique_id == "new@example.com"
     assert entry.title == "Proteus API (new@example.com)"
+    # Inverters of the old account must not be set up for the new one
+    assert await store.async_load_inverters(entry.entry_id) == []
     setup_entry_mock.assert_awaited_once()
 
 
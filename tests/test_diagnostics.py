@@ -0,0 +1,64 @@
+"""Tests for diagnostics."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.proteus_api.const import DOMAIN
+from custom_components.proteus_api.diagnostics import async_get_config_entry_diagnostics
+from custom_components.proteus_api.proteus_api import (
+    DEFAULT_CONNECTOR_PROFILE,
+    ProteusRateLimiter,
+    ProteusRequestStats,
+)
+from custom_components.proteus_api.scheduler import PollScheduler
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_report_session_stats(hass) -> None:
+    """Diagnostics should expose connection reuse without credentials."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"email": "user@example.com", "password": "secret"},
+        unique_id="user@example.com",
+    )
+    entry.add_to_hass(hass)
+    stats = ProteusRequestStats()
+    stats.requests = 4
+    stats.total_request_time = 1.0
+    stats.connections_created = 1
+    stats.connections_reused = 3
+    api = AsyncMock()
+    api.connector_profile = DEFAULT_CONNECTOR_PROFILE
+    api.request_stats = stats
+    api.rate_limiter = ProteusRateLimiter()
+    poll_scheduler = PollScheduler(10, 0)
+    poll_scheduler.register(entry.entry_id)
+    poll_scheduler.register("other-entry")
+    poll_scheduler.set_next_poll(entry.entry_id, hass.loop.time() + 10)
+    poll_scheduler.set_next_poll("other-entry", hass.loop.time() + 5)
+    coordinator = AsyncMock()
+    coordinator.poll_scheduler = poll_scheduler
+    hass.data[DOMAIN] = {
+        entry.entry_id: {
+            "coordinator": coordinator,
+            "inverters": {"inv-1": {"api": api}, "inv-2": {"api": api}},
+        }
+    }
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["entry"]["data"] == {
+        "email": "**REDACTED**",
+        "password": "**REDACTED**",
+    }
+    assert diagnostics["inverters"] == ["inv-1", "inv-2"]
+    assert diagnostics["session"]["request_stats"]["connection_reuse_rate"] == 0.75
+    assert diagnostics["session"]["request_stats"]["mean_request_time"] == 0.25
+    assert diagnostics["session"]["rate_limiter"]["deferred_requests"] == 0
+    assert diagnostics["poll_schedule"]["accounts"] == 2
+    assert diagnostics["poll_schedule"]["phases"] == [0, 5]
+    assert diagnostics["poll_schedule"]["min_gap"] == pytest.approx(5, abs=0.01)
@@ -0,0 +1,688 @@
+"""Tests for account-level fleet polling."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+import json
+from time import time
+from typing import Any
+
+import pytest
+
+from custom_components.proteus_api.const import (
+    API_ENDPOINTS,
+    API_PRICE_ENDPOINT,
+    API_STATUS_ENDPOINTS,
+    UPDATE_INTERVAL,
+)
+from custom_components.proteus_api.proteus_api import (
+    ProteusAPI,
+    ProteusConnectionError,
+    ProteusFleetAPI,
+)
+
+
+class FakeResponse:
+    """aiohttp response test double."""
+
+    def __init__(self, payload: Any) -> None:
+        """Initialize with a JSON payload."""
+        self.status = 200
+        self.method = "GET"
+        self.url = "https://example.invalid"
+        self._text = json.dumps(payload)
+
+    async def text(self) -> str:
+        """Return the response body."""
+        return self._text
+
+
+class FakeRequestContext:
+    """Request context manager yielding a fake response."""
+
+    def __init__(self, response: FakeResponse) -> None:
+        """Initialize with the response."""
+        self.response = response
+        self.released = False
+
+    async def __aenter__(self) -> FakeResponse:
+        """Return the response."""
+        return self.response
+
+    async def __aexit__(self, *args: object) -> bool:
+        """Record the release and do not suppress exceptions."""
+        self.released = True
+        return False
+
+
+def _result(data: Any) -> dict[str, Any]:
+    """Wrap data in a tRPC batch result."""
+    return {"result": {"data": {"json": data}}}
+
+
+class FakeFleetClient:
+    """Retry client test double answering tRPC batches."""
+
+    def __init__(self) -> None:
+        """Initialize the request log."""
+        self.requests: list[tuple[list[str], dict[str, Any]]] = []
+        self.command: dict[str, Any] = {
+            "command": {"type": "UP_POWER", "id": "command-1"},
+            "price": {"priceUp": 1.5},
+        }
+        self.errors: dict[str, dict[str, Any]] = {}
+        self.results: dict[str, Any] = {}
+        self.failures: dict[str, int] = {}
+
+    def post(self, url: str, *, json: Any, headers: Any) -> Any:
+        """Accept a control update."""
+        return FakeRequestContext(FakeResponse([_result(None)]))
+
+    def get(self, url: str, *, params: dict[str, str], headers: Any) -> Any:
+        """Return detail and price results for the requested inverters."""
+        endpoints = url.rsplit("/", 1)[1].split(",")
+        inputs = json.loads(params["input"])
+        self.requests.append((endpoints, inputs))
+
+        payload = []
+        for index, endpoint in enumerate(endpoints):
+            inverter_id = inputs[str(index)]["json"]["inverterId"]
+            if inverter_id == "inv-broken":
+                payload.append(_result(None))
+            elif inverter_id == "inv-denied":
+                payload.append(
+                    {"error": {"json": {"message": "UNAUTHORIZED", "code": -32001}}}
+                )
+            elif endpoint in self.errors:
+                payload.append(self.errors[endpoint])
+            elif endpoint in self.results:
+                payload.append(_result(self.results[endpoint]))
+            elif self.failures.get(endpoint):
+                self.failures[endpoint] -= 1
+                payload.append(
+                    {"error": {"json": {"message": "Internal error", "code": -32603}}}
+                )
+            elif endpoint == "inverters.detail":
+                payload.append(_result({"controlMode": f"MODE-{inverter_id}"}))
+            elif endpoint == "commands.current":
+                payload.append(_result(self.command))
+            elif endpoint == API_PRICE_ENDPOINT:
+                payload.append(_result({"priceConsumptionMwh": 2000}))
+            else:
+                payload.append(_result({}))
+        return FakeRequestContext(FakeResponse(payload))
+
+
+class FleetClientProteusAPI(ProteusAPI):
+    """Proteus API client using a shared fake retry client."""
+
+    client = FakeFleetClient()
+
+    async def _get_client(self) -> Any:
+        """Return the fake retry client."""
+        return self.client
+
+
+@pytest.fixture
+def fleet_client(monkeypatch) -> FakeFleetClient:
+    """Give FleetClientProteusAPI a fresh fake client for one test."""
+    client = FakeFleetClient()
+    monkeypatch.setattr(FleetClientProteusAPI, "client", client)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_fleet_fetches_all_inverters_in_one_batch(fleet_client) -> None:
+    """One batch should cover every inverter and be split per inverter."""
+    apis = {
+        inverter_id: FleetClientProteusAPI(inverter_id, "fleet@example.com", "secret")
+        for inverter_id in ("inv-1", "inv-2", "inv-broken")
+    }
+    fleet = ProteusFleetAPI(apis)
+
+    data = await fleet.get_data()
+
+    requests = fleet_client.requests
+    assert len(requests) == 1
+    endpoints, inputs = requests[0]
+    assert endpoints == list(API_ENDPOINTS) * 3
+    assert [inputs[str(index)]["json"]["inverterId"] for index in range(18)] == [
+        "inv-1"
+    ] * 6 + ["inv-2"] * 6 + ["inv-broken"] * 6
+    assert data["inv-1"]["control_mode"] == "MODE-inv-1"
+    assert data["inv-2"]["control_mode"] == "MODE-inv-2"
+    assert data["inv-2"]["price_consumption_mwh"] == 2000
+    assert isinstance(data["inv-broken"], ProteusConnectionError)
+
+    data = await fleet.get_data()
+
+    endpoints, inputs = requests[1]
+    assert endpoints == list(API_STATUS_ENDPOINTS)
+    assert {inputs[str(index)]["json"]["inverterId"] for index in range(5)} == {
+        "inv-broken"
+    }
+    assert data["inv-1"]["control_mode"] == "MODE-inv-1"
+    assert data["inv-1"]["price_consumption_mwh"] == 2000
+
+    for api in apis.values():
+        await api.close()
+
+
+@pytest.mark.asyncio
+async def test_large_fleet_batches_are_split(monkeypatch, fleet_client) -> None:
+    """Batches above the procedure limit should be sent as several requests."""
+    monkeypatch.setattr(
+        "custom_components.proteus_api.proteus_api.MAX_BATCH_PROCEDURES", 4
+    )
+    apis = {
+        inverter_id: FleetClientProteusAPI(inverter_id, "split@example.com", "secret")
+        for inverter_id in ("inv-1", "inv-2")
+    }
+
+    data = await ProteusFleetAPI(apis).get_data()
+
+    requests = fleet_client.requests
+    assert [len(endpoints) for endpoints, _ in requests] == [4, 4, 4]
+    assert [endpoint for endpoints, _ in requests for endpoint in endpoints] == list(
+        API_ENDPOINTS
+    ) * 2
+    assert data["inv-1"]["control_mode"] == "MODE-inv-1"
+    assert data["inv-2"]["control_mode"] == "MODE-inv-2"
+    assert data["inv-2"]["price_consumption_mwh"] == 2000
+
+    for api in apis.values():
+        await api.close()
+
+
+@pytest.mark.asyncio
+async def test_denied_inverter_does_not_reject_the_session(fleet_client) -> None:
+    """An auth error of one inverter should only fail that inverter."""
+    apis = {
+        inverter_id: FleetClientProteusAPI(inverter_id, "denied@example.com", "secret")
+        for inverter_id in ("inv-1", "inv-denied")
+    }
+
+    data = await ProteusFleetAPI(apis).get_data()
+
+    # Denied procedures are not retried, they would fail again
+    assert len(fleet_client.requests) == 1
+    assert data["inv-1"]["control_mode"] == "MODE-inv-1"
+    assert isinstance(data["inv-denied"], ProteusConnectionError)
+
+    for api in apis.values():
+        await api.close()
+
+
+@pytest.mark.asyncio
+async def test_separate_price_fetch_when_combining_is_disabled(fleet_client) -> None:
+    """Clients can keep status and price in separate requests."""
+    api = FleetClientProteusAPI(
+        "inv-1", "fleet@example.com", "secret", combine_price_fetch=False
+    )
+
+    data = await api.get_data()
+    assert data["control_mode"] == "MODE-inv-1"
+    await asyncio.sleep(0)
+
+    assert [endpoints for endpoints, _ in fleet_client.requests] == [
+        list(API_STATUS_ENDPOINTS),
+        [API_PRICE_ENDPOINT],
+    ]
+    # Prices refreshed in the background are part of the next snapshot
+    assert (await api.get_data())["price_consumption_mwh"] == 2000
+
+    await api.close()
+
+
+class BlockedPriceContext(FakeRequestContext):
+    """Request context manager blocking until the test releases it."""
+
+    def __init__(self, response: FakeResponse, release: asyncio.Event) -> None:
+        """Initialize with the response and the release event."""
+        super().__init__(response)
+        self.release = release
+
+    async def __aenter__(self) -> FakeResponse:
+        """Return the response once released."""
+        await self.release.wait()
+        return self.response
+
+
+class BlockedPriceClient(FakeFleetClient):
+    """Retry client test double whose price requests block."""
+
+    def __init__(self) -> None:
+        """Initialize with an unset release event."""
+        super().__init__()
+        self.release = asyncio.Event()
+
+    def get(self, url: str, *, params: dict[str, str], headers: Any) -> Any:
+        """Block price requests until released."""
+        context = super().get(url, params=params, headers=headers)
+        if url.endswith(API_PRICE_ENDPOINT):
+            return BlockedPriceContext(context.response, self.release)
+        return context
+
+
+@pytest.mark.asyncio
+async def test_blocked_price_fetch_does_not_delay_status(monkeypatch) -> None:
+    """Status polls should complete while a price request hangs."""
+    client = BlockedPriceClient()
+    monkeypatch.setattr(FleetClientProteusAPI, "client", client)
+    apis = {
+        "inv-1": FleetClientProteusAPI(
+            "inv-1", "blocked@example.com", "secret", combine_price_fetch=False
+        )
+    }
+    fleet = ProteusFleetAPI(apis)
+
+    data = await asyncio.wait_for(fleet.get_data(), 1)
+    assert data["inv-1"]["control_mode"] == "MODE-inv-1"
+    assert "price_consumption_mwh" not in data["inv-1"]
+    # The hanging price request is not started a second time
+    await asyncio.wait_for(fleet.get_data(), 1)
+
+    client.release.set()
+    await asyncio.sleep(0)
+    data = await fleet.get_data()
+    assert data["inv-1"]["price_consumption_mwh"] == 2000
+    assert [endpoints for endpoints, _ in client.requests] == [
+        list(API_STATUS_ENDPOINTS),
+        [API_PRICE_ENDPOINT],
+    ]
+
+    await apis["inv-1"].close()
+
+
+class BrokenPriceProteusAPI(FleetClientProteusAPI):
+    """Proteus API client whose price refresh fails unexpectedly."""
+
+    async def update_price_data(self) -> None:
+        """Fail with an unexpected error."""
+        raise ValueError("unexpected price payload")
+
+
+@pytest.mark.asyncio
+async def test_background_price_errors_are_logged(caplog, fleet_client) -> None:
+    """Unexpected price refresh errors should be logged, not dropped."""
+    api = BrokenPriceProteusAPI(
+        "inv-1", "broken-price@example.com", "secret", combine_price_fetch=False
+    )
+
+    assert (await api.get_data())["control_mode"] == "MODE-inv-1"
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+    assert "Unexpected error refreshing prices of inverter inv-1" in caplog.text
+    assert "unexpected price payload" in caplog.text
+    await api.close()
+
+
+@pytest.mark.asyncio
+async def test_polls_only_endpoints_that_are_due_or_invalidated(
+    monkeypatch, fleet_client
+) -> None:
+    """Endpoints should be refreshed on their cadence or after known events."""
+    now = 1000.0
+    monkeypatch.setattr(
+        "custom_components.proteus_api.proteus_api.monotonic", lambda: now
+    )
+    # Right after a quarter hour, the next boundary is 905 seconds away
+    monkeypatch.setattr("custom_components.proteus_api.proteus_api.time", lambda: 0.0)
+    api = FleetClientProteusAPI("inv-1", "cadence@example.com", "secret")
+    requests = fleet_client.requests
+
+    async def poll() -> list[str]:
+        nonlocal now
+        now += UPDATE_INTERVAL
+        request_count = len(requests)
+        data = await api.get_data()
+        assert data["control_mode"] == "MODE-inv-1"
+        return requests[-1][0] if len(requests) > request_count else []
+
+    await api.get_data()
+    assert requests[-1][0] == list(API_ENDPOINTS)
+    assert await poll() == ["commands.current"]
+
+    assert await api.update_manual_control("SAVING_TO_BATTERY", "ENABLED")
+    assert await poll() == ["inverters.controls.state", "commands.current"]
+
+    assert await api.update_control_mode("MANUAL")
+    assert await poll() == [
+        "inverters.detail",
+        "inverters.controls.state",
+        "commands.current",
+    ]
+
+    fleet_client.command = {"command": None}
+    assert await poll() == ["commands.current"]
+    assert await poll() == ["inverters.flexibilityRewardsSummary", "commands.current"]
+
+    now = 1000.0 + 905 - UPDATE_INTERVAL
+    assert "inverters.currentStep" in await poll()
+
+    await api.close()
+
+
+@pytest.mark.asyncio
+async def test_refreshes_command_outcome_after_command_end(
+    monkeypatch, fleet_client
+) -> None:
+    """The command and rewards should be refreshed right after a command ends."""
+    now = 1000.0
+    monkeypatch.setattr(
+        "custom_components.proteus_api.proteus_api.monotonic", lambda: now
+    )
+    monkeypatch.setattr("custom_components.proteus_api.proteus_api.time", lambda: 0.0)
+    end = datetime.now(UTC) + timedelta(seconds=100)
+    fleet_client.command["command"]["endAt"] = end.isoformat()
+    api = FleetClientProteusAPI("inv-1", "boundary@example.com", "secret")
+    requests = fleet_client.requests
+
+    await api.get_data()
+    now += 60
+    await api.get_data()
+    assert requests[-1][0] == ["commands.current"]
+
+    now += 45
+    await api.get_data()
+    assert requests[-1][0] == [
+        "inverters.flexibilityRewardsSummary",
+        "commands.current",
+    ]
+
+    now += UPDATE_INTERVAL
+    await api.get_data()
+    assert requests[-1][0] == ["commands.current"]
+
+    await api.close()
+
+
+class RateLimitingClient(FakeFleetClient):
+    """Retry client test double rejecting every request with HTTP 429."""
+
+    def __init__(self) -> None:
+        """Initialize the request log and the handed out responses."""
+        super().__init__()
+        self.contexts: list[FakeRequestContext] = []
+
+    def get(self, url: str, *, params: dict[str, str], headers: Any) -> Any:
+        """Reject a status batch."""
+        self.requests.append((url.rsplit("/", 1)[1].split(","), {}))
+        response = FakeResponse(
+            [
+                {
+                    "error": {
+                        "json": {
+                            "message": "Too many requests",
+                            "data": {"code": "TOO_MANY_REQUESTS", "retryAfter": 30},
+                        }
+                    }
+                }
+            ]
+        )
+        response.status = 429
+        self.contexts.append(FakeRequestContext(response))
+        return self.contexts[-1]
+
+
+class RateLimitedProteusAPI(ProteusAPI):
+    """Proteus API client using a rate-limiting fake retry client."""
+
+    client = RateLimitingClient()
+
+    async def _get_client(self) -> Any:
+        """Return the fake retry client."""
+        return self.client
+
+
+@pytest.fixture
+def rate_limiting_client(monkeypatch) -> RateLimitingClient:
+    """Give RateLimitedProteusAPI a fresh rate-limiting client for one test."""
+    client = RateLimitingClient()
+    monkeypatch.setattr(RateLimitedProteusAPI, "client", client)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_http_429_defers_following_polls(
+    monkeypatch, rate_limiting_client
+) -> None:
+    """A rejected batch should pause the account's polls."""
+    monkeypatch.setattr(
+        "custom_components.proteus_api.proteus_api.monotonic", lambda: 1000.0
+    )
+    api = RateLimitedProteusAPI("inv-1", "limited@example.com", "secret")
+    other = RateLimitedProteusAPI("inv-2", "limited@example.com", "secret")
+
+    assert await api.fetch_batch({"inv-1": ("commands.current",)}) == (None, True)
+    assert api.rate_limiter.blocked_until == 1030.0
+
+    # Other procedures of the same account are deferred by the limiter
+    assert await other.fetch_batch({"inv-2": ("inverters.detail",)}) == (None, True)
+    assert len(rate_limiting_client.requests) == 1
+    assert not await other.update_control_enabled(True)
+
+    await api.close()
+    await other.close()
+
+
+class FakeCooldownStore:
+    """Cooldown store test double keeping deadlines in memory."""
+
+    def __init__(self, cooldowns: dict[str, float] | None = None) -> None:
+        """Initialize with the stored deadlines."""
+        self.cooldowns = cooldowns or {}
+
+    async def async_load_cooldowns(
+        self, account_key: tuple[str, str]
+    ) -> dict[str, float]:
+        """Return the stored deadlines."""
+        return self.cooldowns
+
+    async def async_save_cooldowns(
+        self, account_key: tuple[str, str], cooldowns: dict[str, float]
+    ) -> None:
+        """Store the deadlines, noting whether every response was released."""
+        self.cooldowns = cooldowns
+        self.saved_after_release = all(
+            context.released for context in RateLimitedProteusAPI.client.contexts
+        )
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_cooldowns_are_persisted_and_restored(
+    fleet_client, rate_limiting_client
+) -> None:
+    """Cooldowns should survive a restart as wall-clock deadlines."""
+    store = FakeCooldownStore()
+    api = RateLimitedProteusAPI(
+        "inv-1", "persisted@example.com", "secret", cooldown_store=store
+    )
+
+    await api.fetch_batch({"inv-1": ("commands.current",)})
+
+    assert list(store.cooldowns) == ["commands.current"]
+    assert store.cooldowns["commands.current"] == pytest.approx(time() + 30, abs=2)
+    assert store.saved_after_release is True
+    await api.close()
+
+    restored = FleetClientProteusAPI(
+        "inv-1",
+        "restored@example.com",
+        "secret",
+        cooldown_store=FakeCooldownStore({"commands.current": time() + 60}),
+    )
+    await restored.async_restore_rate_limit_cooldowns()
+
+    assert await restored.fetch_batch({"inv-1": ("commands.current",)}) == (
+        None,
+        True,
+    )
+    assert fleet_client.requests == []
+    await restored.fetch_batch({"inv-1": ("inverters.detail",)})
+    assert len(fleet_client.requests) == 1
+    await restored.close()
+
+
+@pytest.mark.asyncio
+async def test_cooling_endpoints_are_left_out_of_the_batch(
+    monkeypatch, fleet_client
+) -> None:
+    """A rate-limited endpoint should not hold back the rest of the batch."""
+    now = 1000.0
+    monkeypatch.setattr(
+        "custom_components.proteus_api.proteus_api.monotonic", lambda: now
+    )
+    monkeypatch.setattr("custom_components.proteus_api.proteus_api.time", lambda: 0.0)
+    fleet_client.errors["inverters.flexibilityRewardsSummary"] = {
+        "error": {
+            "json": {
+                "message": "Too many requests",
+                "data": {"code": "TOO_MANY_REQUESTS", "retryAfter": 60},
+            }
+        }
+    }
+    api = FleetClientProteusAPI("inv-1", "cooling@example.com", "secret")
+    requests = fleet_client.requests
+
+    await api.get_data()
+    del fleet_client.errors["inverters.flexibilityRewardsSummary"]
+
+    now += UPDATE_INTERVAL
+    data = await api.get_data()
+    assert requests[-1][0] == ["commands.current"]
+    assert data["control_mode"] == "MODE-inv-1"
+    assert data["current_command"] == "UP_POWER"
+
+    now += 60
+    await api.get_data()
+    assert requests[-1][0] == [
+        "inverters.flexibilityRewardsSummary",
+        "commands.current",
+    ]
+
+    await api.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_procedures_are_retried_or_served_stale(
+    monkeypatch, fleet_client
+) -> None:
+    """Failed procedures should be retried alone, then served stale."""
+    now = 1000.0
+    monkeypatch.setattr(
+        "custom_components.proteus_api.proteus_api.monotonic", lambda: now
+    )
+    monkeypatch.setattr("custom_components.proteus_api.proteus_api.time", lambda: 0.0)
+    api = FleetClientProteusAPI("inv-1", "partial@example.com", "secret")
+
+    fleet_client.failures["inverters.detail"] = 1
+    data = await api.get_data()
+    assert [endpoints for endpoints, _ in fleet_client.requests] == [
+        list(API_ENDPOINTS),
+        ["inverters.detail"],
+    ]
+    assert data["control_mode"] == "MODE-inv-1"
+    assert "stale_endpoints" not in data
+
+    api.invalidate("inverters.detail")
+    fleet_client.failures["inverters.detail"] = 2
+    now += UPDATE_INTERVAL
+    data = await api.get_data()
+    assert fleet_client.requests[-1][0] == ["inverters.detail"]
+    assert data["control_mode"] == "MODE-inv-1"
+    assert data["stale_endpoints"] == ["inverters.detail"]
+
+    now += UPDATE_INTERVAL
+    data = await api.get_data()
+    assert "stale_endpoints" not in data
+
+    await api.close()
+
+
+@pytest.mark.asyncio
+async def test_single_failed_procedure_keeps_inverter_available(
+    monkeypatch, fleet_client
+) -> None:
+    """A poll whose only due procedure fails should serve its cached result."""
+    now = 1000.0
+    monkeypatch.setattr(
+        "custom_components.proteus_api.proteus_api.monotonic", lambda: now
+    )
+    monkeypatch.setattr("custom_components.proteus_api.proteus_api.time", lambda: 0.0)
+    api = FleetClientProteusAPI("inv-1", "stale@example.com", "secret")
+    await api.get_data()
+
+    fleet_client.failures["commands.current"] = 2
+    now += UPDATE_INTERVAL
+    data = await api.get_data()
+    assert [endpoints for endpoints, _ in fleet_client.requests[1:]] == [
+        ["commands.current"],
+        ["commands.current"],
+    ]
+    assert data["current_command"] == "UP_POWER"
+    assert data["stale_endpoints"] == ["commands.current"]
+
+    await api.close()
+
+
+@pytest.mark.asyncio
+async def test_null_result_clears_cached_values(monkeypatch, fleet_client) -> None:
+    """A procedure returning null should clear its values and keep its cadence."""
+    now = 1000.0
+    monkeypatch.setattr(
+        "custom_components.proteus_api.proteus_api.monotonic", lambda: now
+    )
+    monkeypatch.setattr("custom_components.proteus_api.proteus_api.time", lambda: 0.0)
+    api = FleetClientProteusAPI("inv-1", "null@example.com", "secret")
+
+    fleet_client.results["inverters.currentStep"] = {"metadata": {"targetSoC": 80}}
+    assert (await api.get_data())["target_soc"] == 80
+
+    fleet_client.results["inverters.currentStep"] = None
+    api.invalidate("inverters.currentStep")
+    now += UPDATE_INTERVAL
+    assert "target_soc" not in await api.get_data()
+
+    now += UPDATE_INTERVAL
+    await api.get_data()
+    assert fleet_client.requests[-1][0] == ["commands.current"]
+
+    await api.close()
+
+
+@pytest.mark.asyncio
+async def test_endpoint_cache_tracks_fetch_times(monkeypatch, fleet_client) -> None:
+    """Each endpoint should keep its fetch time and unchanged polls no copies."""
+    now = 1000.0
+    monkeypatch.setattr(
+        "custom_components.proteus_api.proteus_api.monotonic", lambda: now
+    )
+    wall_time = 1_800_000_000.0
+    monkeypatch.setattr(
+        "custom_components.proteus_api.proteus_api.time", lambda: wall_time
+    )
+    api = FleetClientProteusAPI("inv-1", "cache@example.com", "secret")
+
+    data = await api.get_data()
+    fetched_at = datetime.fromtimestamp(wall_time, UTC)
+    assert api.get_fetched_at("inverters.detail") == fetched_at
+    assert api.get_fetched_at(API_PRICE_ENDPOINT) == fetched_at
+
+    now += UPDATE_INTERVAL
+    wall_time += UPDATE_INTERVAL
+    assert await api.get_data() is data
+    assert api.get_fetched_at("inverters.detail") == fetched_at
+    assert api.get_fetched_at("commands.current") == fetched_at + timedelta(
+        seconds=UPDATE_INTERVAL
+    )
+
+    fleet_client.command = {"command": None}
+    now += UPDATE_INTERVAL
+    changed = await api.get_data()
+    assert changed is not data
+    assert changed["current_command"] == "NONE"
+
+    await api.close()
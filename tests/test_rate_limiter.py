@@ -0,0 +1,118 @@
+"""Tests for the client-side request budget."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import pytest
+
+from custom_components.proteus_api.proteus_api import (
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_RATE,
+    ProteusRateLimiter,
+)
+
+
+@pytest.fixture
+def now(monkeypatch) -> list[float]:
+    """Patch the monotonic clock to a settable value."""
+    clock = [1000.0]
+    monkeypatch.setattr(
+        "custom_components.proteus_api.proteus_api.monotonic", lambda: clock[0]
+    )
+    return clock
+
+
+def test_polls_leave_tokens_for_writes(now) -> None:
+    """Polls should be deferred once only the write reserve is left."""
+    limiter = ProteusRateLimiter()
+
+    assert [limiter.try_acquire(1) for _ in range(RATE_LIMIT_BURST)] == [
+        True,
+        True,
+        True,
+        True,
+        False,
+    ]
+    assert limiter.try_acquire()
+    assert limiter.deferred_requests == 1
+
+    now[0] += 1 / RATE_LIMIT_RATE
+    assert not limiter.try_acquire(1)
+    assert limiter.try_acquire()
+
+
+def test_rate_adapts_to_rate_limits(now) -> None:
+    """The rate should halve on rate limits and recover additively."""
+    limiter = ProteusRateLimiter()
+
+    limiter.on_rate_limited(30)
+    assert limiter.rate == RATE_LIMIT_RATE / 2
+    assert limiter.get_delay() == 30
+    assert not limiter.try_acquire()
+
+    now[0] += 30
+    assert limiter.try_acquire()
+
+    for _ in range(100):
+        limiter.on_success()
+    assert limiter.rate == limiter.max_rate
+    for _ in range(100):
+        limiter.on_rate_limited()
+    assert limiter.rate == limiter.min_rate
+
+
+@pytest.mark.asyncio
+async def test_writes_wait_for_a_token(now, monkeypatch) -> None:
+    """Writes should wait briefly for a token but not for a long pause."""
+    slept: list[float] = []
+
+    async def sleep(delay: float) -> None:
+        slept.append(delay)
+        now[0] += delay
+
+    monkeypatch.setattr(
+        "custom_components.proteus_api.proteus_api.asyncio.sleep", sleep
+    )
+    limiter = ProteusRateLimiter(burst=1)
+
+    assert await limiter.acquire(5)
+    assert await limiter.acquire(5)
+    assert slept == [1 / RATE_LIMIT_RATE]
+
+    limiter.on_rate_limited(30)
+    assert not await limiter.acquire(5)
+
+
+@pytest.mark.asyncio
+async def test_writes_recheck_the_budget_after_waiting(now, monkeypatch) -> None:
+    """A write should not take a token another request took while it waited."""
+    limiter = ProteusRateLimiter(burst=1)
+    during_sleep: list[Callable[[], None]] = []
+    slept: list[float] = []
+
+    async def sleep(delay: float) -> None:
+        slept.append(delay)
+        now[0] += delay
+        if during_sleep:
+            during_sleep.pop(0)()
+
+    def take_token() -> None:
+        limiter.tokens -= 1
+
+    monkeypatch.setattr(
+        "custom_components.proteus_api.proteus_api.asyncio.sleep", sleep
+    )
+
+    assert await limiter.acquire(5)
+    during_sleep.append(take_token)
+    assert await limiter.acquire(5)
+    assert slept == [1 / RATE_LIMIT_RATE] * 2
+    assert limiter.tokens == 0
+
+    # The server pausing the account while a write waits defers the write
+    slept.clear()
+    during_sleep.append(lambda: limiter.on_rate_limited(30))
+    assert not await limiter.acquire(5)
+    assert slept == [1 / RATE_LIMIT_RATE]
+    assert limiter.tokens == 0
@@ -0,0 +1,232 @@
+"""Tests for poll scheduling policies."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+import logging
+from typing import Any
+
+import pytest
+
+import custom_components.proteus_api as proteus_integration
+from custom_components.proteus_api import ProteusDataUpdateCoordinator
+from custom_components.proteus_api.scheduler import (
+    PollScheduler,
+    get_adaptive_update_interval,
+    get_command_boundary_interval,
+    get_quarter_hour_aligned_interval,
+)
+
+NOW = datetime(2026, 1, 1, 2, 7, tzinfo=UTC)
+IDLE = {"current_command": "NONE", "flexibility_state": "NOT_USABLE"}
+
+
+def _interval(
+    snapshots: list[dict[str, Any]],
+    previous: list[dict[str, Any]] | None,
+    interval: float = 10,
+) -> float:
+    """Return the adaptive interval with a 10 to 120 second range."""
+    return get_adaptive_update_interval(
+        snapshots, previous, interval, floor=10, ceiling=120, now=NOW
+    )
+
+
+def test_backs_off_while_nothing_changes() -> None:
+    """Unchanged idle data should double the interval up to the ceiling."""
+    assert _interval([IDLE], None) == 10
+    assert _interval([IDLE], [IDLE], 10) == 20
+    assert _interval([IDLE], [IDLE], 80) == 120
+    assert _interval([IDLE], [IDLE], 120) == 120
+
+
+def test_polls_fast_after_changes() -> None:
+    """Changed data should reset the interval to the floor."""
+    changed = {**IDLE, "flexibility_state": "USABLE"}
+
+    assert _interval([changed], [IDLE], 120) == 10
+
+
+def test_polls_fast_while_command_is_active_or_about_to_start() -> None:
+    """Active and imminent commands should keep the interval at the floor."""
+    active = {**IDLE, "current_command": "UP_POWER"}
+    upcoming = {**IDLE, "command_start": NOW + timedelta(seconds=90)}
+    later = {**IDLE, "command_start": NOW + timedelta(hours=1)}
+
+    assert _interval([active], [active], 120) == 10
+    assert _interval([IDLE, upcoming], [IDLE, upcoming], 120) == 10
+    assert _interval([later], [later], 20) == 40
+
+    naive = {
+        **IDLE,
+        "command_start": (NOW + timedelta(seconds=90)).replace(tzinfo=None),
+    }
+    assert _interval([naive], [naive], 120) == 10
+
+
+@pytest.mark.asyncio
+async def test_coordinator_adapts_update_interval(hass, monkeypatch) -> None:
+    """The coordinator should back off between its floor and ceiling."""
+    # Halfway between two quarter-hour boundaries
+    monkeypatch.setattr(proteus_integration, "time", lambda: 450.0)
+    snapshot = dict(IDLE)
+
+    async def update_method() -> dict[str, Any]:
+        return dict(snapshot)
+
+    coordinator = ProteusDataUpdateCoordinator(
+        hass,
+        logging.getLogger(__name__),
+        "Proteus API",
+        update_method,
+        timedelta(seconds=10),
+        max_update_interval=timedelta(seconds=30),
+    )
+
+    intervals = []
+    for _ in range(4):
+        await coordinator.async_refresh()
+        intervals.append(coordinator.update_interval.total_seconds())
+
+    snapshot["current_command"] = "DOWN_BATTERY_POWER"
+    await coordinator.async_refresh()
+    intervals.append(coordinator.update_interval.total_seconds())
+
+    assert intervals == [10, 20, 30, 30, 10]
+
+
+@pytest.mark.asyncio
+async def test_coordinator_polls_densely_after_quarter_hour(hass, monkeypatch) -> None:
+    """Backed off polling should resume at the floor after a boundary."""
+    now = 450.0
+    monkeypatch.setattr(proteus_integration, "time", lambda: now)
+
+    async def update_method() -> dict[str, Any]:
+        return dict(IDLE)
+
+    coordinator = ProteusDataUpdateCoordinator(
+        hass,
+        logging.getLogger(__name__),
+        "Proteus API",
+        update_method,
+        timedelta(seconds=10),
+        max_update_interval=timedelta(seconds=120),
+    )
+    for _ in range(5):
+        await coordinator.async_refresh()
+    assert coordinator.update_interval == timedelta(seconds=120)
+
+    now = 850.0
+    await coordinator.async_refresh()
+    assert coordinator.update_interval == timedelta(seconds=50)
+
+    now = 905.0
+    await coordinator.async_refresh()
+    assert coordinator.update_interval == timedelta(seconds=10)
+
+
+@pytest.mark.asyncio
+async def test_phase_shift_keeps_quarter_hour_alignment(hass, monkeypatch) -> None:
+    """Account phases should not delay or waste polls around a boundary."""
+    now = 897.0
+    monkeypatch.setattr(proteus_integration, "time", lambda: now)
+    poll_scheduler = PollScheduler(10, 0)
+    poll_scheduler.register("other-account")
+
+    async def update_method() -> dict[str, Any]:
+        return dict(IDLE)
+
+    coordinator = ProteusDataUpdateCoordinator(
+        hass,
+        logging.getLogger(__name__),
+        "Proteus API",
+        update_method,
+        timedelta(seconds=10),
+        max_update_interval=timedelta(seconds=120),
+        poll_scheduler=poll_scheduler,
+    )
+    assert poll_scheduler.get_phase(coordinator.poll_account) == 5
+
+    await coordinator.async_refresh()
+    assert coordinator.update_interval == timedelta(seconds=3)
+
+    now = 905.0
+    await coordinator.async_refresh()
+    assert coordinator.update_interval == timedelta(seconds=10)
+
+    await coordinator.async_shutdown()
+
+
+def test_aligns_interval_to_quarter_hour_window() -> None:
+    """Polls should be dense right after a boundary and sparse in between."""
+    assert get_quarter_hour_aligned_interval(120, 900.0, floor=10, window=60) == 10
+    assert get_quarter_hour_aligned_interval(120, 959.0, floor=10, window=60) == 10
+    assert get_quarter_hour_aligned_interval(120, 960.0, floor=10, window=60) == 120
+    assert get_quarter_hour_aligned_interval(120, 1750.0, floor=10, window=60) == 50
+
+
+def test_shortens_interval_to_next_command_boundary() -> None:
+    """Polls should follow the next start or end of the current command."""
+    command = {
+        "current_command": "UP_POWER",
+        "command_start": NOW - timedelta(minutes=5),
+        "command_end": NOW + timedelta(seconds=30),
+        "command_effective_end": NOW + timedelta(seconds=40),
+    }
+
+    assert get_command_boundary_interval([IDLE], 120, NOW, delay=2) == 120
+    assert get_command_boundary_interval([IDLE, command], 120, NOW, delay=2) == 32
+    assert get_command_boundary_interval([command], 20, NOW, delay=2) == 20
+    command["command_end"] = NOW - timedelta(seconds=1)
+    assert get_command_boundary_interval([command], 120, NOW, delay=2) == 42
+
+
+def test_spreads_account_polls_over_the_period() -> None:
+    """Accounts should poll at evenly spread phases of the period."""
+    scheduler = PollScheduler(10, 0)
+    for account in ("entry-1", "entry-2", "entry-3", "entry-4"):
+        scheduler.register(account)
+
+    assert [scheduler.get_phase(f"entry-{index}") for index in range(1, 5)] == [
+        0,
+        2.5,
+        5,
+        7.5,
+    ]
+    # The poll is delayed to the next time at the account's phase
+    assert scheduler.get_interval("entry-2", 10, 1001.0) == 11.5
+    assert scheduler.get_interval("entry-3", 10, 1001.0) == 14
+    assert scheduler.get_interval("entry-4", 10, 1001.0) == 16.5
+    assert scheduler.get_interval("entry-2", 120, 1000.0) == 122.5
+
+    for account in ("entry-1", "entry-2", "entry-3", "entry-4"):
+        scheduler.set_next_poll(
+            account, 1000.0 + scheduler.get_interval(account, 10, 1000.0)
+        )
+    spread = scheduler.as_dict(1000.0)
+    assert spread["next_polls"] == [10, 12.5, 15, 17.5]
+    assert spread["min_gap"] == 2.5
+
+    scheduler.unregister("entry-2")
+    assert scheduler.get_phase("entry-3") == 10 / 3
+
+
+def test_jitter_is_bounded() -> None:
+    """Jitter should move a poll by at most the configured bound."""
+    scheduler = PollScheduler(10, 1)
+    scheduler.register("entry-1")
+
+    for _ in range(100):
+        assert 10 <= scheduler.get_interval("entry-1", 10, 1000.0) <= 11
+
+
+def test_phase_shift_keeps_the_floor() -> None:
+    """Phase alignment and jitter should never poll before the interval."""
+    scheduler = PollScheduler(10, 1)
+    for account in ("entry-1", "entry-2", "entry-3"):
+        scheduler.register(account)
+
+    for step in range(100):
+        now = 1000.0 + step * 0.37
+        for account in ("entry-1", "entry-2", "entry-3"):
+            assert 10 <= scheduler.get_interval(account, 10, now) < 21
@@ -10,6 +10,18 @@ import pytest
 from custom_components.proteus_api.sensor import async_setup_entry
 
 
+class _FakeAPI:
+    """Minimal API client stub with cached fetch times."""
+
+    def get_fetched_at(self, endpoint):
+        """Return the fetch time of an endpoint."""
+        if endpoint == "commands.current":
+            return datetime(2026, 4, 21, 14, 50, tzinfo=UTC)
+        if endpoint == "inverters.detail":
+            return datetime(2026, 4, 21, 14, 45, tzinfo=UTC)
+        return None
+
+
 class _FakeCoordinator:
     """Minimal coordinator stub for entity tests."""
 
@@ -64,6 +76,7 @@ async def test_price_sensors_are_created_with_expected_values(hass) -> None:
                                 },
                             }
                         ),
+                        "api": _FakeAPI(),
                         "inverter": {"vendor": "VICTRON_ENERGY"},
                     }
                 }
@@ -126,3 +139,10 @@ async def test_price_sensors_are_created_with_expected_values(hass) -> None:
 
     tariff = by_unique_id["proteus_distribution_tariff_type_inv-1"]
     assert tariff.native_value == "HT"
+
+    data_fetched = by_unique_id["proteus_data_fetched_inv-1"]
+    assert data_fetched.native_value == datetime(2026, 4, 21, 14, 45, tzinfo=UTC)
+    assert data_fetched.extra_state_attributes == {
+        "inverters.detail": datetime(2026, 4, 21, 14, 45, tzinfo=UTC),
+        "commands.current": datetime(2026, 4, 21, 14, 50, tzinfo=UTC),
+    }
@@ -0,0 +1,639 @@
+"""Tests for the shared account session."""
+
+from __future__ import annotations
+
+import asyncio
+from http.cookies import SimpleCookie
+from typing import Any
+
+import pytest
+
+from custom_components.proteus_api.const import (
+    API_ENABLED_ENDPOINT,
+    API_LIST_ENDPOINT,
+    API_LOGIN_ENDPOINT,
+)
+from custom_components.proteus_api.proteus_api import (
+    API_URL,
+    AuthenticationError,
+    ProteusAPI,
+    ProteusConnectionError,
+    ProteusCookieJar,
+    get_cookie_expiry,
+)
+
+
+class FakeResponse:
+    """aiohttp response test double."""
+
+    method = "POST"
+    url = "https://proteus.deltagreen.cz/api/trpc/users.loginWithEmailAndPassword"
+
+    def __init__(
+        self,
+        status: int = 200,
+        cookies: SimpleCookie | None = None,
+        result: str = "{}",
+    ) -> None:
+        """Initialize the fake response."""
+        self.status = status
+        self.cookies = cookies if cookies is not None else SimpleCookie()
+        self.result = result
+
+    async def text(self) -> str:
+        """Return a tRPC batch with one result or a rejected session."""
+        if self.status == 401:
+            return '[{"error": {"json": {"code": -32001, "message": "UNAUTHORIZED"}}}]'
+        return f'[{{"result": {{"data": {{"json": {self.result}}}}}}}]'
+
+    async def json(self) -> Any:
+        """Return an empty JSON body."""
+        return {}
+
+
+class FakeRequestContext:
+    """Request context manager yielding a fake response."""
+
+    def __init__(
+        self,
+        status: int = 200,
+        cookies: SimpleCookie | None = None,
+        result: str = "{}",
+    ) -> None:
+        """Initialize with the response status."""
+        self.status = status
+        self.cookies = cookies
+        self.result = result
+
+    async def __aenter__(self) -> FakeResponse:
+        """Return the fake response."""
+        await asyncio.sleep(0)
+        return FakeResponse(self.status, self.cookies, self.result)
+
+    async def __aexit__(self, *args: object) -> bool:
+        """Do not suppress exceptions."""
+        return False
+
+
+class FakeLoginSession:
+    """aiohttp session test double recording logins."""
+
+    instances: list[FakeLoginSession] = []
+    validation_status = 200
+    login_status = 200
+    login_max_age: int | None = None
+    rejections = 0
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Record the created session."""
+        self.closed = False
+        self.detached = False
+        self.kwargs = kwargs
+        self.cookie_jar = kwargs["cookie_jar"]
+        self.logins = 0
+        self.validations = 0
+        self.requests = 0
+        self.instances.append(self)
+
+    def post(self, url: str, *args: Any, **kwargs: Any) -> FakeRequestContext:
+        """Record a login request and set the session cookies."""
+        if API_LOGIN_ENDPOINT not in url:
+            return self._request()
+        self.logins += 1
+        if self.login_status != 200:
+            return FakeRequestContext(self.login_status)
+        self.cookie_jar.update_cookies(
+            {"proteus_csrf": f"csrf-{self.logins}", "session": "fresh"}, API_URL
+        )
+        cookies: SimpleCookie = SimpleCookie()
+        if self.login_max_age is not None:
+            cookies["session"] = "fresh"
+            cookies["session"]["max-age"] = str(self.login_max_age)
+        return FakeRequestContext(cookies=cookies)
+
+    def get(self, url: str, *args: Any, **kwargs: Any) -> FakeRequestContext:
+        """Record a session validation, inverter discovery or tRPC request."""
+        if API_LIST_ENDPOINT not in url:
+            return self._request()
+        self.validations += 1
+        if FakeLoginSession.rejections:
+            FakeLoginSession.rejections -= 1
+            return FakeRequestContext(401)
+        return FakeRequestContext(
+            self.validation_status, result='[{"id": "inv-1", "vendor": "VICTRON"}]'
+        )
+
+    def _request(self) -> FakeRequestContext:
+        """Answer a tRPC request, rejecting the session while requested."""
+        self.requests += 1
+        if FakeLoginSession.rejections:
+            FakeLoginSession.rejections -= 1
+            return FakeRequestContext(401)
+        return FakeRequestContext()
+
+    async def close(self) -> None:
+        """Record session cleanup."""
+        self.closed = True
+
+    def detach(self) -> None:
+        """Record detaching from a shared connector."""
+        self.closed = True
+        self.detached = True
+
+
+@pytest.fixture(autouse=True)
+def fake_login_session(monkeypatch) -> None:
+    """Replace aiohttp sessions with the fake login session."""
+    FakeLoginSession.instances.clear()
+    FakeLoginSession.validation_status = 200
+    FakeLoginSession.login_status = 200
+    FakeLoginSession.login_max_age = None
+    FakeLoginSession.rejections = 0
+    monkeypatch.setattr(
+        "custom_components.proteus_api.proteus_api.aiohttp.ClientSession",
+        FakeLoginSession,
+    )
+
+
+class FakeCookieStore:
+    """In-memory cookie store."""
+
+    def __init__(self, data: dict[tuple[str, str], dict[str, Any]]) -> None:
+        """Initialize with stored cookies."""
+        self.data = data
+
+    async def async_load_cookies(
+        self, account_key: tuple[str, str]
+    ) -> dict[str, Any] | None:
+        """Return the stored cookies for an account."""
+        return self.data.get(account_key)
+
+    async def async_save_cookies(
+        self, account_key: tuple[str, str], data: dict[str, Any]
+    ) -> None:
+        """Store cookies for an account."""
+        self.data[account_key] = data
+
+    async def async_remove_cookies(self, account_key: tuple[str, str]) -> None:
+        """Forget stored cookies for an account."""
+        self.data.pop(account_key, None)
+
+
+class SessionExposingProteusAPI(ProteusAPI):
+    """Proteus API client exposing its session for unit tests."""
+
+    async def get_session(self) -> Any:
+        """Return the shared account session."""
+        return await self._get_session()
+
+    async def get_client(self) -> Any:
+        """Return the retry client."""
+        return await self._get_client()
+
+
+class SessionClientProteusAPI(ProteusAPI):
+    """Proteus API client sending requests through the fake session."""
+
+    async def _get_client(self) -> Any:
+        """Return the account session in place of a retry client."""
+        session = await self._get_session()
+        self._client_session = session
+        return session
+
+
+@pytest.mark.asyncio
+async def test_inverter_clients_share_one_account_session() -> None:
+    """Clients of the same account should log in once and share the session."""
+    first = SessionExposingProteusAPI("inv-1", "shared@example.com", "secret")
+    second = SessionExposingProteusAPI("inv-2", " Shared@Example.com ", "secret")
+    other = SessionExposingProteusAPI("inv-3", "other@example.com", "secret")
+
+    assert await first.get_session() is await second.get_session()
+    assert await other.get_session() is not await first.get_session()
+    assert [session.logins for session in FakeLoginSession.instances] == [1, 1]
+
+    await first.close()
+    await first.close()
+    assert FakeLoginSession.instances[0].closed is False
+
+    await second.close()
+    assert FakeLoginSession.instances[0].closed is True
+
+    await other.close()
+    assert FakeLoginSession.instances[1].closed is True
+
+
+@pytest.mark.asyncio
+async def test_changed_password_is_verified_on_its_own_session() -> None:
+    """Updated credentials must be verified without disturbing the session."""
+    current = SessionExposingProteusAPI("inv-1", "changed@example.com", "old")
+    session = await current.get_session()
+
+    updated = SessionExposingProteusAPI("", "changed@example.com", "new")
+    assert await updated.get_session() is not session
+
+    assert [session.logins for session in FakeLoginSession.instances] == [1, 1]
+    assert session.closed is False
+    assert await current.get_session() is session
+    await updated.close()
+
+    # The verified password is used by the next client of the account
+    joined = SessionExposingProteusAPI("inv-2", "changed@example.com", "new")
+    assert await joined.get_session() is session
+
+    await joined.close()
+    await current.close()
+
+
+@pytest.mark.asyncio
+async def test_wrong_password_leaves_shared_session_untouched() -> None:
+    """A rejected password must not be applied to the running account."""
+    current = SessionExposingProteusAPI("inv-1", "wrong@example.com", "secret")
+    session = await current.get_session()
+
+    FakeLoginSession.login_status = 401
+    wrong = SessionExposingProteusAPI("", "wrong@example.com", "WRONG")
+    with pytest.raises(AuthenticationError):
+        await wrong.get_session()
+    await wrong.close(handover=True)
+
+    assert session.closed is False
+    assert await current.get_session() is session
+    # Clients with the running password still join the shared session
+    joined = SessionExposingProteusAPI("inv-2", "wrong@example.com", "secret")
+    assert await joined.get_session() is session
+    assert session.logins == 1
+
+    await joined.close()
+    await current.close()
+
+
+@pytest.mark.asyncio
+async def test_restores_persisted_cookies_without_login() -> None:
+    """Accepted persisted cookies should replace the password login."""
+    account_key = ("TID_DELTA_GREEN", "stored@example.com")
+    store = FakeCookieStore(
+        {account_key: {"cookies": {"proteus_csrf": "stored"}, "expires": None}}
+    )
+    api = SessionExposingProteusAPI(
+        "inv-1", "stored@example.com", "secret", cookie_store=store
+    )
+
+    await api.get_session()
+
+    session = FakeLoginSession.instances[0]
+    assert (session.logins, session.validations) == (0, 1)
+    assert api.get_headers()["x-proteus-csrf"] == "stored"
+    await api.close()
+
+
+@pytest.mark.asyncio
+async def test_rejected_persisted_cookies_fall_back_to_login() -> None:
+    """Rejected persisted cookies should be replaced by a fresh login."""
+    FakeLoginSession.validation_status = 401
+    account_key = ("TID_DELTA_GREEN", "rejected@example.com")
+    store = FakeCookieStore(
+        {account_key: {"cookies": {"proteus_csrf": "stale"}, "expires": None}}
+    )
+    api = SessionExposingProteusAPI(
+        "inv-1", "rejected@example.com", "secret", cookie_store=store
+    )
+
+    await api.get_session()
+
+    session = FakeLoginSession.instances[0]
+    assert (session.logins, session.validations) == (1, 1)
+    assert api.get_headers()["x-proteus-csrf"] == "csrf-1"
+    assert store.data[account_key]["cookies"] == {
+        "proteus_csrf": "csrf-1",
+        "session": "fresh",
+    }
+    await api.close()
+
+
+@pytest.mark.asyncio
+async def test_retry_client_is_reused_until_session_changes() -> None:
+    """The retry client should only be rebuilt for a replaced session."""
+    api = SessionExposingProteusAPI("inv-1", "retry@example.com", "secret")
+
+    client = await api.get_client()
+    assert await api.get_client() is client
+
+    await FakeLoginSession.instances[0].close()
+    assert await api.get_client() is not client
+    assert len(FakeLoginSession.instances) == 2
+
+    await api.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_login() -> None:
+    """Concurrent clients should wait for the same in-flight login."""
+    first = SessionExposingProteusAPI("inv-1", "flight@example.com", "secret")
+    second = SessionExposingProteusAPI("inv-2", "flight@example.com", "secret")
+
+    sessions = await asyncio.gather(first.get_session(), second.get_session())
+
+    assert sessions[0] is sessions[1]
+    assert [session.logins for session in FakeLoginSession.instances] == [1]
+    await first.close()
+    await second.close()
+
+
+@pytest.mark.asyncio
+async def test_renews_session_before_cookie_expiry(monkeypatch) -> None:
+    """A session close to its cookie expiry should be renewed in place."""
+    clock = [1000.0]
+    monkeypatch.setattr(
+        "custom_components.proteus_api.proteus_api.time", lambda: clock[0]
+    )
+    FakeLoginSession.login_max_age = 60
+    api = SessionExposingProteusAPI("inv-1", "renew@example.com", "secret")
+
+    # Short-lived sessions are renewed halfway through their lifetime
+    session = await api.get_session()
+    clock[0] += 29
+    assert await api.get_session() is session
+    assert session.logins == 1
+
+    clock[0] += 2
+    assert await api.get_session() is session
+    assert [session.logins for session in FakeLoginSession.instances] == [2]
+    await api.close()
+
+
+def test_cookie_expiry_ignores_deleted_and_csrf_cookies() -> None:
+    """Deleted cookies and the CSRF token should not limit the session."""
+    cookies: SimpleCookie = SimpleCookie()
+    cookies["session"] = "fresh"
+    cookies["session"]["max-age"] = "3600"
+    cookies["proteus_csrf"] = "token"
+    cookies["proteus_csrf"]["max-age"] = "60"
+    cookies["legacy"] = ""
+    cookies["legacy"]["max-age"] = "0"
+    cookies["old"] = ""
+    cookies["old"]["expires"] = "Thu, 01 Jan 1970 00:00:00 GMT"
+
+    assert get_cookie_expiry(cookies, 1000.0) == 4600.0
+
+
+@pytest.mark.asyncio
+async def test_rejected_login_backs_off() -> None:
+    """Rejected credentials should not be retried on every call."""
+    FakeLoginSession.login_status = 401
+    api = SessionExposingProteusAPI("inv-1", "backoff@example.com", "wrong")
+
+    with pytest.raises(AuthenticationError, match="Invalid email or password"):
+        await api.get_session()
+    with pytest.raises(AuthenticationError, match="Invalid email or password"):
+        await api.get_session()
+
+    assert [session.logins for session in FakeLoginSession.instances] == [1]
+    assert FakeLoginSession.instances[0].closed is True
+    await api.close()
+
+
+@pytest.mark.asyncio
+async def test_headers_are_cached_until_csrf_cookie_changes() -> None:
+    """Request headers should be rebuilt only after a new CSRF cookie."""
+    api = SessionExposingProteusAPI("inv-1", "headers@example.com", "secret")
+    session = await api.get_session()
+
+    headers = api.get_headers()
+    post_headers = api.get_headers(for_post=True)
+    assert headers["x-proteus-csrf"] == "csrf-1"
+    assert post_headers["trpc-accept"] == "application/jsonl"
+    assert api.get_headers() is headers
+    assert api.get_headers(for_post=True) is post_headers
+
+    session.cookie_jar.update_cookies({"other": "value"}, API_URL)
+    assert api.get_headers() is headers
+
+    session.cookie_jar.update_cookies({"proteus_csrf": "rotated"}, API_URL)
+    assert api.get_headers()["x-proteus-csrf"] == "rotated"
+    assert api.get_headers(for_post=True)["x-proteus-csrf"] == "rotated"
+    await api.close()
+
+
+@pytest.mark.asyncio
+async def test_factory_sessions_are_detached_from_shared_connector() -> None:
+    """Sessions on a shared connector should be detached, not closed."""
+    api = SessionExposingProteusAPI(
+        "inv-1",
+        "factory@example.com",
+        "secret",
+        session_factory=FakeLoginSession,
+    )
+
+    session = await api.get_session()
+    await api.close()
+
+    assert isinstance(session.kwargs["cookie_jar"], ProteusCookieJar)
+    assert "connector" not in session.kwargs
+    assert session.detached is True
+    assert api.connector_profile is None
+
+
+@pytest.mark.asyncio
+async def test_handed_over_session_is_reused_by_next_client(monkeypatch) -> None:
+    """A handed over session should be taken over without a new login."""
+    monkeypatch.setattr(
+        "custom_components.proteus_api.proteus_api.SESSION_HANDOVER_TIMEOUT", 0
+    )
+    discovery = SessionExposingProteusAPI("", "handover@example.com", "secret")
+    session = await discovery.get_session()
+    await discovery.close(handover=True)
+    assert session.closed is False
+
+    inverter = SessionExposingProteusAPI("inv-1", "handover@example.com", "secret")
+    assert await inverter.get_session() is session
+    assert session.logins == 1
+
+    await inverter.close(handover=True)
+    for _ in range(3):
+        await asyncio.sleep(0)
+    assert session.closed is True
+
+
+@pytest.mark.asyncio
+async def test_rejected_session_logs_in_again_and_replays(monkeypatch) -> None:
+    """Reads and writes rejected with 401 should be replayed after a login."""
+    clock = [1000.0]
+    monkeypatch.setattr(
+        "custom_components.proteus_api.proteus_api.time", lambda: clock[0]
+    )
+    api = SessionClientProteusAPI("inv-1", "relogin@example.com", "secret")
+
+    await api.fetch_batch({"inv-1": ("commands.current",)})
+    clock[0] += 120
+    FakeLoginSession.rejections = 1
+    payload, keep_cached_data = await api.fetch_batch({"inv-1": ("commands.current",)})
+
+    assert keep_cached_data is False
+    assert payload is not None
+    first, second = FakeLoginSession.instances
+    assert (first.logins, first.requests, first.closed) == (1, 2, True)
+    assert (second.logins, second.requests) == (1, 1)
+
+    clock[0] += 120
+    FakeLoginSession.rejections = 1
+    assert await api.update_control_enabled(True)
+    assert len(FakeLoginSession.instances) == 3
+    assert FakeLoginSession.instances[2].requests == 1
+    await api.close()
+
+
+class WriteRecordingProteusAPI(SessionClientProteusAPI):
+    """Proteus API client recording its write budget and responses."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize with empty records."""
+        super().__init__(*args, **kwargs)
+        self.budgets: list[str] = []
+        self.statuses: list[int] = []
+
+    async def _acquire_write_budget(self, operation: str) -> bool:
+        """Record the write taking a token."""
+        self.budgets.append(operation)
+        return await super()._acquire_write_budget(operation)
+
+    def _record_write_response(self, status: int, response_text: str) -> None:
+        """Record the status of a write response."""
+        self.statuses.append(status)
+        super()._record_write_response(status, response_text)
+
+
+@pytest.mark.asyncio
+async def test_replayed_write_takes_budget_and_records_both_responses(
+    monkeypatch,
+) -> None:
+    """A replayed mutation should count against the budget like the first one."""
+    clock = [1000.0]
+    monkeypatch.setattr(
+        "custom_components.proteus_api.proteus_api.time", lambda: clock[0]
+    )
+    api = WriteRecordingProteusAPI("inv-1", "replay@example.com", "secret")
+
+    await api.fetch_batch({"inv-1": ("commands.current",)})
+    clock[0] += 120
+    FakeLoginSession.rejections = 1
+    assert await api.update_control_enabled(True)
+
+    assert api.budgets == [
+        "Control enabled update",
+        f"Replay of {API_ENABLED_ENDPOINT}",
+    ]
+    assert api.statuses == [401, 200]
+    await api.close()
+
+
+@pytest.mark.asyncio
+async def test_fresh_session_rejection_does_not_log_in_again(monkeypatch) -> None:
+    """A session rejected right after its login should not loop logins."""
+    monkeypatch.setattr(
+        "custom_components.proteus_api.proteus_api.time", lambda: 1000.0
+    )
+    api = SessionClientProteusAPI("inv-1", "fresh@example.com", "secret")
+
+    FakeLoginSession.rejections = 2
+    with pytest.raises(ProteusConnectionError):
+        await api.fetch_batch({"inv-1": ("commands.current",)})
+    assert not await api.update_control_enabled(True)
+
+    assert len(FakeLoginSession.instances) == 1
+    assert FakeLoginSession.instances[0].logins == 1
+    await api.close()
+
+
+@pytest.mark.asyncio
+async def test_persistent_session_rejection_backs_off_logins(monkeypatch) -> None:
+    """Sessions rejected again after each login should delay the next login."""
+    clock = [1000.0]
+    monkeypatch.setattr(
+        "custom_components.proteus_api.proteus_api.time", lambda: clock[0]
+    )
+    monkeypatch.setattr(
+        "custom_components.proteus_api.proteus_api.monotonic", lambda: clock[0]
+    )
+    api = SessionClientProteusAPI("inv-1", "forbidden@example.com", "secret")
+
+    def logins() -> int:
+        return sum(session.logins for session in FakeLoginSession.instances)
+
+    FakeLoginSession.rejections = 100
+    with pytest.raises(ProteusConnectionError):
+        await api.fetch_batch({"inv-1": ("commands.current",)})
+    assert logins() == 1
+
+    clock[0] += 61
+    with pytest.raises(ProteusConnectionError):
+        await api.fetch_batch({"inv-1": ("commands.current",)})
+    assert logins() == 2
+
+    # The second rejected login doubles the backoff past the next renewal
+    clock[0] += 4
+    with pytest.raises(ProteusConnectionError):
+        await api.fetch_batch({"inv-1": ("commands.current",)})
+    clock[0] += 57
+    with pytest.raises(AuthenticationError):
+        await api.fetch_batch({"inv-1": ("commands.current",)})
+    assert logins() == 2
+
+    FakeLoginSession.rejections = 0
+    clock[0] += 60
+    await api.fetch_batch({"inv-1": ("commands.current",)})
+    assert logins() == 3
+    await api.close()
+
+
+@pytest.mark.asyncio
+async def test_verifying_credentials_requires_a_password_login() -> None:
+    """Credential checks must not be satisfied by the account's cookies."""
+    account_key = ("TID_DELTA_GREEN", "verify@example.com")
+    store = FakeCookieStore(
+        {account_key: {"cookies": {"proteus_csrf": "stored"}, "expires": None}}
+    )
+    current = SessionExposingProteusAPI(
+        "inv-1", "verify@example.com", "secret", cookie_store=store
+    )
+    session = await current.get_session()
+    assert (session.logins, session.validations) == (0, 1)
+
+    FakeLoginSession.login_status = 401
+    for password in ("secret", "WRONG"):
+        check = SessionExposingProteusAPI(
+            "", "verify@example.com", password, verify_credentials=True
+        )
+        with pytest.raises(AuthenticationError):
+            await check.get_session()
+        await check.close(handover=True)
+
+    assert [session.logins for session in FakeLoginSession.instances] == [0, 1, 1]
+    assert session.closed is False
+    assert await current.get_session() is session
+    await current.close()
+
+
+@pytest.mark.asyncio
+async def test_rejected_inverter_discovery_logs_in_again(monkeypatch) -> None:
+    """A discovery rejected with 401 should be replayed after a new login."""
+    clock = [1000.0]
+    monkeypatch.setattr(
+        "custom_components.proteus_api.proteus_api.time", lambda: clock[0]
+    )
+    api = SessionClientProteusAPI("", "discovery@example.com", "secret")
+    await api.fetch_inverters()
+
+    clock[0] += 120
+    FakeLoginSession.rejections = 1
+    inverters = await api.fetch_inverters()
+
+    assert [inverter["id"] for inverter in inverters] == ["inv-1"]
+    assert [session.logins for session in FakeLoginSession.instances] == [1, 1]
+    assert FakeLoginSession.instances[0].closed is True
+
+    # Rejected again right after the login, the credentials are at fault
+    FakeLoginSession.rejections = 1
+    with pytest.raises(AuthenticationError):
+        await api.fetch_inverters()
+    await api.close()
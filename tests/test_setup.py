@@ -10,6 +10,9 @@ from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 import custom_components.proteus_api as proteus_integration
 from custom_components.proteus_api.const import DOMAIN
+from custom_components.proteus_api.proteus_api import ProteusConnectionError
+from custom_components.proteus_api.storage import async_get_inverter_store
+from homeassistant import config_entries
 from homeassistant.exceptions import ConfigEntryNotReady
 
 
@@ -18,44 +21,73 @@ class FakeProteusAPI:
 
     instances: list[FakeProteusAPI] = []
 
-    def __init__(self, inverter_id: str, email: str, password: str) -> None:
+    def __init__(
+        self, inverter_id: str, email: str, password: str, **kwargs: Any
+    ) -> None:
         """Initialize the fake client."""
         self.inverter_id = inverter_id
         self.email = email
         self.password = password
         self.close_calls = 0
+        self.fetch_calls = 0
+        self.restore_calls = 0
         self.instances.append(self)
 
     async def fetch_inverters(self) -> list[dict[str, str]]:
         """Return two fake inverters."""
+        self.fetch_calls += 1
         return [{"id": "inv-1"}, {"id": "inv-2"}]
 
     async def get_data(self) -> dict[str, Any]:
         """Return fake inverter data."""
         return {}
 
-    async def close(self) -> None:
+    async def async_restore_rate_limit_cooldowns(self) -> None:
+        """Record that persisted cooldowns were restored."""
+        self.restore_calls += 1
+
+    async def close(self, *, handover: bool = False) -> None:
         """Record that the fake client was closed."""
         self.close_calls += 1
 
 
-class FailingSecondCoordinator:
-    """Coordinator test double that fails the second inverter refresh."""
+class FakeFleetAPI:
+    """Fleet API test double returning data for every inverter."""
 
-    def __init__(
-        self,
-        *args: Any,
-        name: str,
-        update_method: Any,
-        update_interval: Any,
-    ) -> None:
-        """Initialize the fake coordinator."""
-        self.name = name
+    instances: list[FakeFleetAPI] = []
+
+    def __init__(self, apis: dict[str, FakeProteusAPI]) -> None:
+        """Initialize the fake fleet."""
+        self.apis = apis
+        self.calls = 0
+        self.instances.append(self)
 
-    async def async_config_entry_first_refresh(self) -> None:
-        """Fail while refreshing the second inverter."""
-        if self.name == "proteus_api_inv-2":
-            raise RuntimeError("refresh failed")
+    async def get_data(self) -> dict[str, dict[str, Any] | Exception]:
+        """Return fake data for all inverters."""
+        self.calls += 1
+        return {inverter_id: {"inverter": inverter_id} for inverter_id in self.apis}
+
+
+class FailingSecondFleetAPI(FakeFleetAPI):
+    """Fleet API test double that fails the second inverter."""
+
+    async def get_data(self) -> dict[str, dict[str, Any] | Exception]:
+        """Fail the second inverter's data."""
+        data = await super().get_data()
+        data["inv-2"] = ProteusConnectionError("refresh failed")
+        return data
+
+
+class DiscoveredOnlyFleetAPI(FakeFleetAPI):
+    """Fleet API test double failing inverters removed from the account."""
+
+    async def get_data(self) -> dict[str, dict[str, Any] | Exception]:
+        """Fail inverters that discovery no longer reports."""
+        data = await super().get_data()
+        for inverter_id in data:
+            if inverter_id not in {"inv-1", "inv-2"}:
+                data[inverter_id] = ProteusConnectionError("inverter not found")
+        return data
 
 
 class ConnectionFailingProteusAPI(FakeProteusAPI):
@@ -66,27 +98,45 @@ class ConnectionFailingProteusAPI(FakeProteusAPI):
         raise ClientConnectionError("cannot connect")
 
 
-@pytest.mark.asyncio
-async def test_setup_closes_created_api_clients_when_inverter_refresh_fails(
-    hass, monkeypatch, enable_custom_integrations
-) -> None:
-    """Partial setup should not leak API sessions."""
+class VendorChangingProteusAPI(FakeProteusAPI):
+    """Proteus API test double reporting changed inverter details."""
+
+    async def fetch_inverters(self) -> list[dict[str, str]]:
+        """Return the same inverters with a different vendor."""
+        self.fetch_calls += 1
+        return [{"id": "inv-1", "vendor": "VICTRON_ENERGY"}, {"id": "inv-2"}]
+
+
+async def _async_forward_nothing(*args: Any) -> None:
+    """Skip platform setup."""
+
+
+def _add_entry(hass) -> MockConfigEntry:
+    """Add a config entry and make it the entry being set up."""
     FakeProteusAPI.instances.clear()
+    FakeFleetAPI.instances.clear()
     entry = MockConfigEntry(
         domain=DOMAIN,
         data={"email": "user@example.com", "password": "secret"},
         unique_id="user@example.com",
     )
     entry.add_to_hass(hass)
+    entry.mock_state(hass, config_entries.ConfigEntryState.SETUP_IN_PROGRESS)
+    config_entries.current_entry.set(entry)
+    return entry
+
+
+@pytest.mark.asyncio
+async def test_setup_closes_created_api_clients_when_inverter_refresh_fails(
+    hass, monkeypatch, enable_custom_integrations
+) -> None:
+    """Partial setup should not leak API sessions."""
+    entry = _add_entry(hass)
 
     monkeypatch.setattr(proteus_integration, "ProteusAPI", FakeProteusAPI)
-    monkeypatch.setattr(
-        proteus_integration,
-        "ProteusDataUpdateCoordinator",
-        FailingSecondCoordinator,
-    )
+    monkeypatch.setattr(proteus_integration, "ProteusFleetAPI", FailingSecondFleetAPI)
 
-    with pytest.raises(RuntimeError, match="refresh failed"):
+    with pytest.raises(ConfigEntryNotReady, match="inverter inv-2: refresh failed"):
         await proteus_integration.async_setup_entry(hass, entry)
 
     assert [api.inverter_id for api in FakeProteusAPI.instances] == [
@@ -103,13 +153,7 @@ async def test_setup_retries_raw_aiohttp_connection_errors(
     hass, monkeypatch, enable_custom_integrations
 ) -> None:
     """Startup transport failures should ask Home Assistant to retry setup."""
-    FakeProteusAPI.instances.clear()
-    entry = MockConfigEntry(
-        domain=DOMAIN,
-        data={"email": "user@example.com", "password": "secret"},
-        unique_id="user@example.com",
-    )
-    entry.add_to_hass(hass)
+    entry = _add_entry(hass)
 
     monkeypatch.setattr(proteus_integration, "ProteusAPI", ConnectionFailingProteusAPI)
 
@@ -119,3 +163,153 @@ async def test_setup_retries_raw_aiohttp_connection_errors(
     assert len(FakeProteusAPI.instances) == 1
     assert FakeProteusAPI.instances[0].close_calls == 1
     assert entry.entry_id not in hass.data.get(DOMAIN, {})
+
+
+@pytest.mark.asyncio
+async def test_fleet_coordinator_updates_inverter_coordinators(
+    hass, monkeypatch, enable_custom_integrations
+) -> None:
+    """All inverters should be refreshed by one account-level update."""
+    entry = _add_entry(hass)
+
+    monkeypatch.setattr(proteus_integration, "ProteusAPI", FakeProteusAPI)
+    monkeypatch.setattr(proteus_integration, "ProteusFleetAPI", FakeFleetAPI)
+    monkeypatch.setattr(
+        hass.config_entries, "async_forward_entry_setups", _async_forward_nothing
+    )
+
+    assert await proteus_integration.async_setup_entry(hass, entry)
+
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    assert FakeFleetAPI.instances[0].calls == 1
+    assert list(FakeFleetAPI.instances[0].apis) == ["inv-1", "inv-2"]
+    for inverter_id, inverter_info in entry_data["inverters"].items():
+        assert inverter_info["coordinator"].data == {"inverter": inverter_id}
+        assert inverter_info["coordinator"].update_interval is None
+    assert (
+        sum(
+            inverter_info["api"].restore_calls
+            for inverter_info in entry_data["inverters"].values()
+        )
+        == 1
+    )
+
+    await entry_data["coordinator"].async_refresh()
+    assert FakeFleetAPI.instances[0].calls == 2
+
+    await entry_data["coordinator"].async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_setup_uses_cached_inverters_and_revalidates_in_background(
+    hass, monkeypatch, enable_custom_integrations
+) -> None:
+    """Cached inverters should be set up without blocking on discovery."""
+    entry = _add_entry(hass)
+    store = async_get_inverter_store(hass)
+    await store.async_save_inverters(
+        entry.entry_id, [{"id": "inv-1", "vendor": "GOODWE", "extra": True}]
+    )
+
+    monkeypatch.setattr(proteus_integration, "ProteusAPI", FakeProteusAPI)
+    monkeypatch.setattr(proteus_integration, "ProteusFleetAPI", FakeFleetAPI)
+    monkeypatch.setattr(
+        hass.config_entries, "async_forward_entry_setups", _async_forward_nothing
+    )
+    reloads: list[str] = []
+    monkeypatch.setattr(hass.config_entries, "async_schedule_reload", reloads.append)
+
+    assert await proteus_integration.async_setup_entry(hass, entry)
+    inverters = hass.data[DOMAIN][entry.entry_id]["inverters"]
+    assert list(inverters) == ["inv-1"]
+    assert inverters["inv-1"]["inverter"] == {"id": "inv-1", "vendor": "GOODWE"}
+    assert [api.inverter_id for api in FakeProteusAPI.instances] == ["inv-1"]
+
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert FakeProteusAPI.instances[0].fetch_calls == 1
+    assert await store.async_load_inverters(entry.entry_id) == [
+        {"id": "inv-1"},
+        {"id": "inv-2"},
+    ]
+    assert reloads == [entry.entry_id]
+
+    await hass.data[DOMAIN][entry.entry_id]["coordinator"].async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_revalidation_updates_cached_inverter_details_in_place(
+    hass, monkeypatch, enable_custom_integrations
+) -> None:
+    """Changed inverter details should not require a reload."""
+    entry = _add_entry(hass)
+    await async_get_inverter_store(hass).async_save_inverters(
+        entry.entry_id, [{"id": "inv-1", "vendor": "GOODWE"}, {"id": "inv-2"}]
+    )
+
+    monkeypatch.setattr(proteus_integration, "ProteusAPI", VendorChangingProteusAPI)
+    monkeypatch.setattr(proteus_integration, "ProteusFleetAPI", FakeFleetAPI)
+    monkeypatch.setattr(
+        hass.config_entries, "async_forward_entry_setups", _async_forward_nothing
+    )
+    reloads: list[str] = []
+    monkeypatch.setattr(hass.config_entries, "async_schedule_reload", reloads.append)
+
+    assert await proteus_integration.async_setup_entry(hass, entry)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    inverters = hass.data[DOMAIN][entry.entry_id]["inverters"]
+    assert inverters["inv-1"]["inverter"] == {
+        "id": "inv-1",
+        "vendor": "VICTRON_ENERGY",
+    }
+    assert reloads == []
+
+    await hass.data[DOMAIN][entry.entry_id]["coordinator"].async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_failed_cached_setup_falls_back_to_discovery(
+    hass, monkeypatch, enable_custom_integrations
+) -> None:
+    """A removed cached inverter should not keep the setup failing."""
+    entry = _add_entry(hass)
+    store = async_get_inverter_store(hass)
+    await store.async_save_inverters(entry.entry_id, [{"id": "inv-removed"}])
+
+    monkeypatch.setattr(proteus_integration, "ProteusAPI", FakeProteusAPI)
+    monkeypatch.setattr(proteus_integration, "ProteusFleetAPI", DiscoveredOnlyFleetAPI)
+    monkeypatch.setattr(
+        hass.config_entries, "async_forward_entry_setups", _async_forward_nothing
+    )
+
+    assert await proteus_integration.async_setup_entry(hass, entry)
+
+    assert list(hass.data[DOMAIN][entry.entry_id]["inverters"]) == ["inv-1", "inv-2"]
+    assert await store.async_load_inverters(entry.entry_id) == [
+        {"id": "inv-1"},
+        {"id": "inv-2"},
+    ]
+    assert FakeProteusAPI.instances[0].close_calls == 1
+
+    await hass.data[DOMAIN][entry.entry_id]["coordinator"].async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_failed_cached_setup_with_current_cache_is_retried(
+    hass, monkeypatch, enable_custom_integrations
+) -> None:
+    """A setup failure of current cached inverters should not be repeated."""
+    entry = _add_entry(hass)
+    await async_get_inverter_store(hass).async_save_inverters(
+        entry.entry_id, [{"id": "inv-1"}, {"id": "inv-2"}]
+    )
+
+    monkeypatch.setattr(proteus_integration, "ProteusAPI", FakeProteusAPI)
+    monkeypatch.setattr(proteus_integration, "ProteusFleetAPI", FailingSecondFleetAPI)
+
+    with pytest.raises(ConfigEntryNotReady, match="inverter inv-2: refresh failed"):
+        await proteus_integration.async_setup_entry(hass, entry)
+
+    assert len(FailingSecondFleetAPI.instances) == 1
+    assert all(api.close_calls == 1 for api in FakeProteusAPI.instances)
@@ -0,0 +1,31 @@
+"""Tests for persistent storage."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.proteus_api.storage import (
+    COOLDOWN_STORAGE_KEY,
+    ProteusCooldownStore,
+)
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+
+
+@pytest.mark.asyncio
+async def test_cooldown_bursts_are_written_once(hass, hass_storage) -> None:
+    """Cooldowns saved in a burst should be collected into one delayed write."""
+    store = ProteusCooldownStore(hass)
+    account_key = ("TID_DELTA_GREEN", "burst@example.com")
+
+    await store.async_save_cooldowns(account_key, {"commands.current": 1000.0})
+    await store.async_save_cooldowns(account_key, {"commands.current": 1030.0})
+    assert COOLDOWN_STORAGE_KEY not in hass_storage
+    assert await store.async_load_cooldowns(account_key) == {"commands.current": 1030.0}
+
+    # Pending changes are written at the latest when Home Assistant stops
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+    await hass.async_block_till_done()
+
+    assert hass_storage[COOLDOWN_STORAGE_KEY]["data"] == {
+        "TID_DELTA_GREEN/burst@example.com": {"commands.current": 1030.0}
+    }
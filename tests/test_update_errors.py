@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from datetime import timedelta
 import logging
 from typing import Any
@@ -11,8 +12,12 @@ from aiohttp.client_exceptions import ClientConnectionError
 import pytest
 
 from custom_components.proteus_api import ProteusDataUpdateCoordinator
-from custom_components.proteus_api.const import UPDATE_INTERVAL
-from custom_components.proteus_api.proteus_api import AuthenticationError, ProteusAPI
+from custom_components.proteus_api.const import API_PRICE_ENDPOINT, UPDATE_INTERVAL
+from custom_components.proteus_api.proteus_api import (
+    AuthenticationError,
+    ProteusAPI,
+    ProteusConnectionError,
+)
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.update_coordinator import UpdateFailed
 
@@ -25,14 +30,28 @@ class StubProteusAPI(ProteusAPI):
         super().__init__("inverter-1", "user@example.com", "secret")
         self.client = object()
         self.parsed_data: dict[str, Any] = {}
+        self.price_exception: Exception | None = None
         self.price_result: tuple[Any | None, bool] = (None, False)
         self.status_exception: Exception | None = None
-        self.status_result: tuple[Any | None, bool] = ([], False)
+        self.status_result: tuple[Any | None, bool] = (
+            [{"result": {"data": {"json": {}}}}],
+            False,
+        )
         self._next_price_update = float("inf")
 
     def set_cached_data(self, data: dict[str, Any]) -> None:
         """Set the cached status data."""
-        self._last_data = data
+        self._endpoint_cache = {"inverters.detail": {"data": data, "fetched_at": 0.0}}
+
+    def set_price_due(self, cached_prices: dict[str, Any]) -> None:
+        """Make a separate price refresh due with previously cached prices."""
+        self.combine_price_fetch = False
+        if cached_prices:
+            self._endpoint_cache[API_PRICE_ENDPOINT] = {
+                "data": cached_prices,
+                "fetched_at": 0.0,
+            }
+        self._next_price_update = 0.0
 
     async def _get_client(self) -> object:
         """Return a stub client."""
@@ -46,11 +65,32 @@ class StubProteusAPI(ProteusAPI):
             if self.status_exception is not None:
                 raise self.status_exception
             return self.status_result
+        if self.price_exception is not None:
+            raise self.price_exception
         return self.price_result
 
-    def _parse_data(self, raw_data: Any) -> dict[str, Any]:
-        """Return stubbed parser output."""
-        return self.parsed_data
+    def _parse_endpoint_data(self, endpoint: str, result: Any) -> dict[str, Any]:
+        """Return stubbed parser output for the first endpoint."""
+        return self.parsed_data if endpoint == "inverters.detail" else {}
+
+
+class SlowStatusProteusAPI(StubProteusAPI):
+    """Stub client whose status response waits for the price request."""
+
+    def __init__(self) -> None:
+        """Initialize the stub client."""
+        super().__init__()
+        self.price_requested = asyncio.Event()
+
+    async def _fetch_trpc_batch(
+        self, *args: Any, scope: str
+    ) -> tuple[Any | None, bool]:
+        """Answer status only once the price request has started."""
+        if scope == "status":
+            await self.price_requested.wait()
+        else:
+            self.price_requested.set()
+        return await super()._fetch_trpc_batch(*args, scope=scope)
 
 
 class ExposedProteusDataUpdateCoordinator(ProteusDataUpdateCoordinator):
@@ -69,6 +109,7 @@ class FailingLoginSession:
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         """Record the created session."""
         self.closed = False
+        self.cookie_jar = kwargs["cookie_jar"]
         self.instances.append(self)
 
     def post(self, *args: Any, **kwargs: Any) -> Any:
@@ -190,6 +231,45 @@ async def test_get_data_raises_during_status_cooldown_without_cached_status() ->
         await api.get_data()
 
 
+@pytest.mark.asyncio
+async def test_get_data_fetches_status_and_price_concurrently() -> None:
+    """A separate price request should run alongside the status request."""
+    api = SlowStatusProteusAPI()
+    api.set_price_due({"price_consumption_mwh": 1000})
+    api.parsed_data = {"state": "ok"}
+    api.price_result = (
+        [{"result": {"data": {"json": {"priceConsumptionMwh": 2000}}}}],
+        False,
+    )
+
+    data = await asyncio.wait_for(api.get_data(), timeout=1)
+
+    assert data["state"] == "ok"
+    assert data["price_consumption_mwh"] == 2000
+
+
+@pytest.mark.asyncio
+async def test_get_data_keeps_cached_prices_when_price_fetch_fails() -> None:
+    """Price transport failures should not fail the status update."""
+    api = StubProteusAPI()
+    api.set_price_due({"price_consumption_mwh": 1000})
+    api.parsed_data = {"state": "ok"}
+    api.price_exception = ProteusConnectionError("price unavailable")
+
+    assert await api.get_data() == {"state": "ok", "price_consumption_mwh": 1000}
+
+
+@pytest.mark.asyncio
+async def test_get_data_raises_status_failure_while_price_succeeds() -> None:
+    """Status failures should still fail the update when prices are fetched."""
+    api = StubProteusAPI()
+    api.set_price_due({})
+    api.status_exception = ProteusConnectionError("status unavailable")
+
+    with pytest.raises(ProteusConnectionError, match="status unavailable"):
+        await api.get_data()
+
+
 @pytest.mark.asyncio
 async def test_coordinator_converts_authentication_errors(hass) -> None:
     """Authentication errors should trigger Home Assistant reauth handling."""